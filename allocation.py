@@ -0,0 +1,172 @@
+"""
+Integer apportionment of study time.
+
+Splits each student's daily budget into whole minutes (or whole slots such as
+Pomodoros) so the per-subject amounts always add up to the budget exactly.
+Students are laid out like planner.generate_study_plans_batch: one flat
+weights array plus CSR-style offsets.
+"""
+import numpy as np
+import pandas as pd
+
+from planner import segment_ids
+
+POMODORO_MINUTES = 25
+
+def _segment_cumsum(values, ids, n_segments):
+    """
+    Cumulative sum that restarts at every segment (``ids`` must be sorted).
+
+    Taken as a global cumsum minus earlier segments' totals, so values carry
+    cancellation error of the order of the running total; callers snap the
+    points they need exactly.
+    """
+    total = np.cumsum(values)
+    seg_total = np.bincount(ids, weights=values, minlength=n_segments)
+    before = np.concatenate(([0.0], np.cumsum(seg_total)[:-1]))
+    return total - before[ids]
+
+def _capped_quotas(weights, ids, budgets, lo, hi):
+    """
+    Real-valued quotas ``clip(lam * w, lo, hi)`` with each segment's ``lam``
+    chosen so the quotas sum to its budget.
+
+    The sum is a piecewise-linear, non-decreasing function of ``lam`` with a
+    breakpoint wherever an item enters (lo / w) or leaves (hi / w) the active
+    range, so one sort of all breakpoints finds every segment's ``lam``.
+    """
+    n_segments = len(budgets)
+    positive = weights > 0
+    safe_w = np.where(positive, weights, 1.0)
+
+    # Each item contributes two events: entering the active range adds w to
+    # the slope and removes lo from the constant term; leaving does the reverse
+    # with hi. Zero-weight items stay pinned at lo and never produce events.
+    event_ids = np.concatenate((ids, ids))
+    event_t = np.concatenate((lo / safe_w, hi / safe_w))
+    event_dc = np.concatenate((np.where(positive, -lo, 0.0), np.where(positive, hi, 0.0)))
+    event_ds = np.concatenate((np.where(positive, weights, 0.0), np.where(positive, -weights, 0.0)))
+    event_t = np.where(np.concatenate((positive, positive)), event_t, 0.0)
+
+    order = np.lexsort((event_t, event_ids))
+    event_ids, event_t = event_ids[order], event_t[order]
+    base = np.bincount(ids, weights=lo, minlength=n_segments)
+    c = base[event_ids] + _segment_cumsum(event_dc[order], event_ids, n_segments)
+    s = _segment_cumsum(event_ds[order], event_ids, n_segments)
+
+    # Slopes that should be exactly zero (gaps between items, and after every
+    # item has left) come out of the cumsum as rounding noise, which would
+    # pick lambda off the wrong piece. Snap them, and pin each segment's last
+    # event to its exact total: every item at hi.
+    w_sum = np.bincount(ids, weights=weights, minlength=n_segments)
+    s = np.where(s <= w_sum[event_ids] * 1e-9, 0.0, s)
+    seg_start = np.searchsorted(event_ids, np.arange(n_segments))
+    seg_last = np.searchsorted(event_ids, np.arange(n_segments), side="right") - 1
+    has_events = seg_last >= seg_start
+    c[seg_last[has_events]] = np.bincount(ids, weights=np.where(positive, hi, lo),
+                                          minlength=n_segments)[has_events]
+    f = c + s * event_t
+
+    # First event per segment at which the total reaches the budget; the
+    # budget is hit on the linear piece just before it. The total only grows
+    # within a segment, so that is its start plus the number of events below.
+    tol = np.maximum(budgets, 1.0) * 1e-9
+    below = f < (budgets - tol)[event_ids]
+    first = seg_start + np.bincount(event_ids, weights=below, minlength=n_segments).astype(np.int64)
+
+    has_prev = first > seg_start
+    prev = np.where(has_prev, first - 1, 0)
+    c_prev = np.where(has_prev, c[prev], base)
+    s_prev = np.where(has_prev, s[prev], 0.0)
+    t_hit = event_t[np.minimum(first, len(event_ids) - 1)]
+    lam = np.where(s_prev > 0, (budgets - c_prev) / np.where(s_prev > 0, s_prev, 1.0), t_hit)
+    lam = np.where(base >= budgets, 0.0, lam)
+
+    return np.clip(lam[ids] * weights, lo, hi)
+
+def apportion(weights, offsets, budgets, min_units=None, max_units=None):
+    """
+    Split integer ``budgets`` (one per segment) across each segment's items in
+    proportion to ``weights``, using the largest-remainder method.
+
+    ``min_units`` / ``max_units`` are optional per-item integer caps. The
+    result is an int64 array aligned with ``weights`` whose segment sums equal
+    ``budgets`` exactly. Runs in O(n log n) over all items.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    ids = segment_ids(offsets)
+    n_segments = len(offsets) - 1
+    if len(ids) != len(weights):
+        raise ValueError("offsets[-1] must equal the number of weights")
+    if (weights < 0).any():
+        raise ValueError("weights must be non-negative")
+
+    budgets = np.broadcast_to(np.asarray(budgets), (n_segments,)).astype(np.int64)
+    lo = np.zeros(len(weights)) if min_units is None else np.broadcast_to(np.asarray(min_units, dtype=np.float64), weights.shape)
+    hi = np.full(len(weights), np.inf) if max_units is None else np.broadcast_to(np.asarray(max_units, dtype=np.float64), weights.shape)
+    lo = np.ceil(lo)
+    # Nothing can take more than its whole budget, which keeps breakpoints finite
+    hi = np.minimum(np.floor(hi), budgets[ids])
+    # Zero-weight items are pinned at their minimum
+    hi = np.where(weights > 0, hi, lo)
+    if (lo > hi).any():
+        raise ValueError("every min cap must be <= its max cap")
+
+    lo_sum = np.bincount(ids, weights=lo, minlength=n_segments)
+    hi_sum = np.bincount(ids, weights=hi, minlength=n_segments)
+    infeasible = (budgets < lo_sum) | (budgets > hi_sum)
+    if infeasible.any():
+        raise ValueError(f"{int(infeasible.sum())} budget(s) cannot be met within the min/max caps")
+
+    if len(weights) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    quotas = _capped_quotas(weights, ids, budgets.astype(np.float64), lo, hi)
+
+    units = np.clip(np.floor(quotas), lo, hi)
+    remainder = budgets - np.bincount(ids, weights=units, minlength=n_segments).astype(np.int64)
+
+    # Hand the leftover units to the largest fractional parts in each segment;
+    # items already at their max sort last and never take one
+    frac = np.where(units < hi, quotas - units, -1.0)
+    order = np.lexsort((-frac, ids))
+    sorted_ids = ids[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_ids, sorted_ids)
+    units[order[(rank < remainder[sorted_ids]) & (frac[order] >= 0)]] += 1
+
+    assert (np.bincount(ids, weights=units, minlength=n_segments) == budgets).all()
+    assert ((units >= lo) & (units <= hi)).all()
+    return units.astype(np.int64)
+
+def allocate_minutes(weights, offsets, total_hours, slot_minutes=1,
+                     min_minutes=None, max_minutes=None):
+    """
+    Per-subject daily minutes in whole ``slot_minutes`` blocks.
+
+    Each student's budget is ``total_hours`` rounded down to whole slots, and
+    the returned minutes add up to exactly that. Caps are in minutes and are
+    rounded inwards to whole slots.
+    """
+    n_students = len(offsets) - 1
+    total_minutes = np.broadcast_to(np.asarray(total_hours, dtype=np.float64) * 60, (n_students,))
+    budgets = np.floor(total_minutes / slot_minutes + 1e-9).astype(np.int64)
+    min_units = None if min_minutes is None else np.ceil(np.asarray(min_minutes, dtype=np.float64) / slot_minutes - 1e-9)
+    max_units = None if max_minutes is None else np.floor(np.asarray(max_minutes, dtype=np.float64) / slot_minutes + 1e-9)
+    return apportion(weights, offsets, budgets, min_units, max_units) * slot_minutes
+
+def generate_minute_plan(subjects, weights, total_hours, slot_minutes=1,
+                         min_minutes=None, max_minutes=None):
+    """
+    Single-student counterpart of generate_study_plan with exact integer
+    minutes and, for ``slot_minutes > 1``, the number of slots per subject
+    """
+    minutes = allocate_minutes(weights, [0, len(weights)], total_hours, slot_minutes,
+                               min_minutes, max_minutes)
+    data = {
+        "Subject": subjects,
+        "Difficulty Weight": weights,
+        "Daily Allocated Minutes": minutes,
+    }
+    if slot_minutes > 1:
+        data["Daily Slots"] = minutes // slot_minutes
+    return pd.DataFrame(data)
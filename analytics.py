@@ -0,0 +1,125 @@
+"""
+Vectorized analytics over a user's study progress history.
+
+Everything works on the NumPy arrays returned by ProgressStore.history and
+runs in O(n) without Python-level loops over days, so summaries stay fast
+for years of logs. ``lttb`` thins a series down for plotting.
+"""
+import numpy as np
+
+ROLLING_WINDOWS = (7, 30)
+
+
+def daily_totals(days, hours):
+    """
+    Sum entries per calendar day over the contiguous range from the first to
+    the last logged day (missed days are 0). Returns (dates, totals).
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    hours = np.asarray(hours, dtype=np.float64)
+    if len(days) == 0:
+        return np.zeros(0, dtype="datetime64[D]"), np.zeros(0)
+    start = days.min()
+    offsets = (days - start).astype(np.int64)
+    totals = np.bincount(offsets, weights=hours, minlength=int(offsets.max()) + 1)
+    return start + np.arange(len(totals)), totals
+
+
+def rolling_mean(values, window):
+    """
+    Trailing mean over ``window`` entries; the first ``window - 1`` average
+    over what is available so far
+    """
+    values = np.asarray(values, dtype=np.float64)
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    idx = np.arange(1, len(values) + 1)
+    lo = np.maximum(idx - window, 0)
+    return (csum[idx] - csum[lo]) / (idx - lo)
+
+
+def streaks(totals):
+    """
+    Length of the run of consecutive active days (totals > 0) ending at
+    each day; 0 on missed days
+    """
+    active = np.asarray(totals) > 0
+    idx = np.arange(1, len(active) + 1)
+    last_gap = np.maximum.accumulate(np.where(active, 0, idx)) if len(active) else idx
+    return idx - last_gap
+
+
+def cumulative_progress(totals, goal_hours):
+    """
+    Cumulative hours studied as a fraction of ``goal_hours``
+    """
+    cumulative = np.cumsum(np.asarray(totals, dtype=np.float64))
+    if goal_hours <= 0:
+        return np.zeros_like(cumulative)
+    return cumulative / goal_hours
+
+
+def summarize(days, hours, target_hours, days_remaining=0):
+    """
+    Daily series and headline numbers for the tracker.
+
+    ``target_hours`` is the daily goal and ``days_remaining`` the days left
+    until the exam, which together with the days already tracked set the
+    total goal for cumulative progress.
+    """
+    dates, totals = daily_totals(days, hours)
+    run = streaks(totals)
+    goal = target_hours * (len(totals) + max(days_remaining, 0))
+    progress = cumulative_progress(totals, goal)
+
+    summary = {
+        "dates": dates,
+        "daily": totals,
+        "deviation": totals - target_hours,
+        "streak": run,
+        "active_days": int(np.count_nonzero(totals > 0)),
+        "cumulative": progress,
+        "longest_streak": int(run.max()) if len(run) else 0,
+        "exam_progress": float(progress[-1]) if len(progress) else 0.0,
+    }
+    for window in ROLLING_WINDOWS:
+        rolling = rolling_mean(totals, window)
+        summary[f"rolling_{window}"] = rolling
+        summary[f"mean_{window}"] = float(rolling[-1]) if len(rolling) else 0.0
+    return summary
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling of (x, y) to ``n_out``
+    points, keeping the first and last point and the visually significant
+    peaks and dips in between. Returns the selected indices.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries for the n - 2 interior points
+    edges = np.arange(n_out - 1) * (n - 2) // (n_out - 2) + 1
+    edges[-1] = n - 1
+
+    # Each bucket's average point is the third triangle vertex for the
+    # bucket before it; the final vertex is the last point itself
+    csx = np.concatenate(([0.0], np.cumsum(x)))
+    csy = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    avg_x = np.append((csx[edges[1:]] - csx[edges[:-1]]) / counts, x[-1])
+    avg_y = np.append((csy[edges[1:]] - csy[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
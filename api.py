@@ -0,0 +1,314 @@
+"""
+JSON HTTP API for plan generation, score prediction and PDF rendering.
+
+    python api.py --port 8000 --workers 4
+
+Endpoints (request bodies are JSON, using the same student fields as
+cli.py: ``subjects``, ``difficulties``, ``daily_hours`` and an optional
+``exam_date``):
+
+    GET  /health    liveness plus current load
+    POST /plan      the daily allocation per subject
+    POST /predict   predicted score and band; either a student record or
+                    ``{"rows": [[hours, days, difficulty], ...]}``
+    POST /pdf       the plan as application/pdf
+    POST /schedule  deadline-optimized hours per subject and per day; takes
+                    ``exam_dates`` (one per subject) instead of ``exam_date``
+
+Plans and predictions are computed in the request thread against the
+in-memory model. PDFs already in the on-disk artifact cache are returned
+directly; the rest render in a process pool behind a bounded queue. When
+the queue or the overall in-flight limit is full the request is refused
+straight away with 503 and ``Retry-After``, instead of piling up. A PDF
+that takes longer than PDF_TIMEOUT answers 504, but keeps its queue slot
+until the render actually finishes.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import pdf_jobs
+from cli import parse_student, split_field
+from ml_model import predict_batch, score_status
+from model_registry import live_predictor, load_incremental_model, refresh_incremental_model
+from optimizer import optimize_study_plan
+from planner import build_study_plan
+from progress_store import ProgressStore
+from tracing import traced
+from utils import calculate_days_remaining
+
+API_WORKERS = int(os.environ.get("STUDY_PLANNER_API_WORKERS", os.cpu_count() or 1))
+# PDF jobs allowed to wait for a worker, on top of the ones rendering
+API_QUEUE = int(os.environ.get("STUDY_PLANNER_API_QUEUE", 4 * API_WORKERS))
+API_MAX_INFLIGHT = int(os.environ.get("STUDY_PLANNER_API_MAX_INFLIGHT", "256"))
+MAX_BODY_BYTES = 1 << 20
+PDF_TIMEOUT = 60
+# How often /predict picks up mock scores logged in the app since the last look
+MODEL_REFRESH_SECONDS = 30
+
+
+class Busy(Exception):
+    """
+    The service is saturated; the client should retry later
+    """
+
+
+class RenderTimeout(Exception):
+    """
+    A PDF took longer than PDF_TIMEOUT; it keeps its queue slot until done
+    """
+
+
+def _warm_worker():
+    # Pay for the reportlab import once per worker, not on the first request
+    import pdf_generator  # noqa: F401
+
+
+class PlanService:
+    """
+    The API's work, independent of HTTP. Holds the predictor in memory and
+    owns the PDF worker pool.
+
+    Predictions come from the same live incremental model as the app,
+    refreshed from the progress store at most every MODEL_REFRESH_SECONDS.
+    """
+
+    def __init__(self, workers=API_WORKERS, queue_size=API_QUEUE, store=None):
+        self._store = ProgressStore() if store is None else store
+        self._model = load_incremental_model()
+        self._refreshed_at = None
+        self.predictor = None
+        self._refresh_model()
+        self.workers = workers
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        self._pdf_slots = threading.BoundedSemaphore(workers + queue_size)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _refresh_model(self):
+        now = time.monotonic()
+        if self._refreshed_at is not None and now - self._refreshed_at < MODEL_REFRESH_SECONDS:
+            return
+        self._refreshed_at = now
+        if refresh_incremental_model(self._model, self._store) or self.predictor is None:
+            self.predictor = live_predictor(self._model)
+
+    @traced("api.plan")
+    def plan(self, payload):
+        subjects, weights, daily_hours, exam_date = parse_student(payload, require_exam_date=False)
+        plan = build_study_plan(subjects, weights, daily_hours)
+        result = {
+            "daily_hours": daily_hours,
+            "plan": [
+                {"subject": subject, "weight": weight, "hours": hours}
+                for subject, weight, hours in plan.rows()
+            ],
+        }
+        if exam_date is not None:
+            result["days_remaining"] = calculate_days_remaining(exam_date)
+        return result
+
+    @traced("api.schedule")
+    def schedule(self, payload):
+        subjects, weights, daily_hours, _ = parse_student(payload, require_exam_date=False)
+        exam_dates = [date.fromisoformat(d) for d in split_field(payload["exam_dates"])]
+        if len(exam_dates) != len(subjects):
+            raise ValueError("exam_dates needs one date per subject")
+        today = date.today()
+        if min(exam_dates) <= today:
+            raise ValueError("exam_dates must be after today")
+        totals, plan = optimize_study_plan(subjects, weights, exam_dates, daily_hours, start_date=today)
+        return {
+            "daily_hours": daily_hours,
+            "totals": [
+                {"subject": subject, "exam_date": exam.isoformat(), "hours": float(hours)}
+                for subject, exam, hours in zip(subjects, exam_dates, totals["Total Hours"])
+            ],
+            "schedule": [
+                {"date": day.isoformat(), "subject": subject, "hours": float(hours)}
+                for day, subject, hours in zip(plan["Date"], plan["Subject"], plan["Hours"])
+            ],
+        }
+
+    @traced("api.predict")
+    def predict(self, payload):
+        if "rows" in payload:
+            X = np.asarray(payload["rows"], dtype=np.float64)
+            if X.ndim != 2:
+                raise ValueError("rows must be a list of [hours, days, difficulty]")
+        else:
+            _, weights, daily_hours, exam_date = parse_student(payload)
+            X = np.array([[daily_hours, calculate_days_remaining(exam_date), np.mean(weights)]])
+        self._refresh_model()
+        scores, _ = predict_batch(X, self.predictor)
+        # Band the scores as returned, like the app does
+        scores = np.round(scores, 2)
+        return {"scores": scores.tolist(), "bands": score_status(scores).tolist()}
+
+    @traced("api.pdf")
+    def pdf(self, payload):
+        subjects, weights, daily_hours, _ = parse_student(payload, require_exam_date=False)
+        plan = build_study_plan(subjects, weights, daily_hours)
+        # Plans rendered before (by any worker or the app) skip the pool
+        day = date.today()
+        cached = pdf_jobs.cached_pdf(plan, day)
+        if cached is not None:
+            return cached
+        if not self._pdf_slots.acquire(blocking=False):
+            raise Busy("PDF queue is full")
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool.submit(pdf_jobs.render_pdf, plan, day)
+        except BaseException:
+            self._release_slot()
+            raise
+        # The slot is held until the render really ends, even if this
+        # request gives up waiting, so slow renders can't bypass the queue
+        future.add_done_callback(self._release_slot)
+        try:
+            return future.result(PDF_TIMEOUT)
+        except FutureTimeout:
+            raise RenderTimeout(f"PDF rendering took longer than {PDF_TIMEOUT}s") from None
+
+    def _release_slot(self, future=None):
+        with self._lock:
+            self._pending -= 1
+        self._pdf_slots.release()
+
+    def health(self):
+        return {"status": "ok", "workers": self.workers, "pdf_pending": self._pending}
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 resets connections under bursts long
+    # before the in-flight limit is reached
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, self.server.service.health())
+
+    def do_POST(self):
+        route = {
+            "/plan": self.server.service.plan,
+            "/predict": self.server.service.predict,
+            "/pdf": self.server.service.pdf,
+            "/schedule": self.server.service.schedule,
+        }.get(self.path.split("?")[0])
+        if route is None:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        raw_length = self.headers.get("Content-Length", "0").strip()
+        if not (raw_length.isascii() and raw_length.isdigit()):
+            # The body can't be delimited, so the connection can't be reused
+            self.close_connection = True
+            self._send_json(400, {"error": "Content-Length must be a non-negative integer"})
+            return
+        length = int(raw_length)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": "request body too large"})
+            return
+        body = self.rfile.read(length)
+
+        if not self.server.inflight.acquire(blocking=False):
+            self._send_json(503, {"error": "server busy"}, retry_after=1)
+            return
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("request body must be a JSON object")
+            result = route(payload)
+        except Busy as e:
+            self._send_json(503, {"error": str(e)}, retry_after=1)
+            return
+        except RenderTimeout as e:
+            self._send_json(504, {"error": str(e)})
+            return
+        except (KeyError, ValueError, TypeError) as e:
+            message = f"missing field {e}" if isinstance(e, KeyError) else str(e)
+            self._send_json(400, {"error": message})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        finally:
+            self.server.inflight.release()
+
+        if isinstance(result, bytes):
+            self._send(200, result, "application/pdf")
+        else:
+            self._send_json(200, result)
+
+    def _send_json(self, status, obj, retry_after=None):
+        self._send(status, json.dumps(obj).encode("utf-8"), "application/json", retry_after)
+
+    def _send(self, status, body, content_type, retry_after=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8000, service=None, max_inflight=API_MAX_INFLIGHT):
+    """
+    Build (but don't start) the HTTP server; call serve_forever() on it
+    """
+    server = _Server((host, port), _Handler)
+    server.service = PlanService() if service is None else service
+    server.inflight = threading.BoundedSemaphore(max_inflight)
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the study planner as a JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-j", "--workers", type=int, default=API_WORKERS,
+                        help="PDF worker processes (default: all cores)")
+    parser.add_argument("--queue", type=int, default=API_QUEUE,
+                        help="PDF jobs allowed to wait for a worker before returning 503")
+    parser.add_argument("--max-inflight", type=int, default=API_MAX_INFLIGHT,
+                        help="concurrent requests before returning 503")
+    args = parser.parse_args(argv)
+
+    service = PlanService(workers=args.workers, queue_size=args.queue)
+    server = make_server(args.host, args.port, service, args.max_inflight)
+    print(f"Serving on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,19 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from datetime import date, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-import base64
-from PIL import Image
-import io
-
-from ml_model import train_model
-from planner import generate_study_plan
+
+# Only lightweight modules are imported up front. matplotlib (charts),
+# reportlab (PDF) and scikit-learn (model training/unpickling) are imported
+# where they are first needed, so a cold start doesn't pay for them.
+from ml_model import predict_batch, score_status
+from optimizer import optimize_study_plan
+from planner import DIFFICULTY_MAP, generate_multi_exam_plan
 from utils import calculate_days_remaining, get_weakest_subject
-from pdf_generator import generate_pdf
+from progress_store import ProgressStore
+import analytics
+import pdf_jobs
+import tracing
 
 # -----------------------------
 # PAGE CONFIGURATION
@@ -319,6 +320,57 @@ def load_css():
 # Load CSS
 load_css()
 
+# -----------------------------
+# CACHED RESOURCES
+# -----------------------------
+# The live model starts from the synthetic training data and is refined by
+# the mock test scores users log in the tracker
+@st.cache_resource
+def get_live_model():
+    from model_registry import load_incremental_model, refresh_incremental_model
+
+    model = load_incremental_model()
+    refresh_incremental_model(model, get_progress_store())
+    return model
+
+@st.cache_resource
+def get_progress_store():
+    return ProgressStore()
+
+# Each results stage is cached on its own inputs, so a rerun only
+# recomputes the stages whose inputs changed (plan -> charts via the chart
+# module's LRU cache, inputs -> prediction). Plans are array-backed
+# StudyPlans; CSV comes straight from the arrays and PDFs render in the
+# background through pdf_jobs, so only the on-screen table builds a
+# DataFrame.
+@st.cache_data(show_spinner=False)
+def build_plan(subjects, weights, total_hours, exam_dates, today):
+    # ``today`` keys the cache: the urgency weights change as exams approach
+    return generate_multi_exam_plan(list(subjects), list(weights), list(exam_dates), total_hours, today)
+
+@st.cache_data(show_spinner=False)
+def build_optimized_plan(subjects, weights, total_hours, exam_dates, today):
+    return optimize_study_plan(list(subjects), list(weights), list(exam_dates), total_hours,
+                               start_date=today)
+
+@st.cache_data(show_spinner=False)
+def predict_performance(total_hours, days_remaining, avg_difficulty, model_version):
+    # model_version only keys the cache: a new score refits the live model
+    from model_registry import live_predictor
+
+    scores, _ = predict_batch(np.array([[total_hours, days_remaining, avg_difficulty]]),
+                              live_predictor(get_live_model()))
+    # Band the score that is shown, so 49.996 ("50.0%") isn't "At Risk"
+    score = round(float(scores[0]), 2)
+    return score, str(score_status(score))
+
+@st.cache_resource
+def start_metrics_server(port):
+    return tracing.serve_prometheus(port)
+
+if tracing.enabled() and tracing.METRICS_PORT:
+    start_metrics_server(tracing.METRICS_PORT)
+
 # -----------------------------
 # SIDEBAR - ENHANCED INFO PANEL
 # -----------------------------
@@ -408,6 +460,11 @@ with st.container():
             value=date.today() + timedelta(days=30),
             help="Select your exam date"
         )
+        
+        separate_exam_dates = st.checkbox(
+            "🗓️ Different exam date per subject",
+            help="Subjects with earlier exams get more time until their exam is over"
+        )
     
     with col2:
         st.markdown("<h3 style='color: #1a1a2e; margin-bottom: 1rem;'>⚡ Quick Stats</h3>", unsafe_allow_html=True)
@@ -430,17 +487,12 @@ with st.container():
     
     subjects = []
     weights = []
-    
-    difficulty_map = {
-        "Weak": 3,
-        "Medium": 2,
-        "Strong": 1
-    }
+    exam_dates = []
     
     # Create beautiful subject cards
     for i in range(num_subjects):
         with st.container():
-            cols = st.columns([1, 1, 0.1])
+            cols = st.columns([1, 1, 1, 0.1] if separate_exam_dates else [1, 1, 0.1])
             
             with cols[0]:
                 subject = st.text_input(
@@ -458,9 +510,21 @@ with st.container():
                     help="Select your current proficiency level"
                 )
             
+            subject_exam_date = exam_date
+            if separate_exam_dates:
+                with cols[2]:
+                    subject_exam_date = st.date_input(
+                        f"Subject {i+1} Exam Date",
+                        min_value=date.today(),
+                        value=exam_date,
+                        key=f"exam_{i}",
+                        help="When is the exam for this subject?"
+                    )
+            
             if subject.strip() != "":
                 subjects.append(subject)
-                weights.append(difficulty_map[difficulty])
+                weights.append(DIFFICULTY_MAP[difficulty])
+                exam_dates.append(subject_exam_date)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -477,20 +541,25 @@ with col2:
 # -----------------------------
 # STUDY PLAN RESULTS
 # -----------------------------
-if generate_button:
-    if len(subjects) == 0:
-        st.error("⚠️ Please enter at least one subject name to generate your study plan.")
-        st.stop()
-    
+def render_results(subjects, weights, total_hours, exam_dates, just_generated):
     with st.spinner('🤖 AI is generating your personalized study plan...'):
         # Generate study plan
-        df, allocated_hours = generate_study_plan(subjects, weights, total_hours)
-        days_remaining = calculate_days_remaining(exam_date)
+        plan, daily_hours = build_plan(tuple(subjects), tuple(weights), total_hours,
+                                       tuple(exam_dates), date.today())
+        allocated_hours = plan.hours.tolist()
+        # Study runs until the last exam; urgency follows the next one
+        days_remaining = calculate_days_remaining(max(exam_dates))
+        next_exam_days = calculate_days_remaining(min(exam_dates))
         weakest_subject = get_weakest_subject(subjects, weights)
     
+    # Start rendering the PDF now; the download button picks it up from the
+    # cache, so the rest of the page never waits on ReportLab
+    pdf_key = pdf_jobs.submit_pdf(plan)
+    
     # Success animation
-    st.balloons()
-    st.success("✅ Study plan generated successfully! Your personalized schedule is ready.")
+    if just_generated:
+        st.balloons()
+        st.success("✅ Study plan generated successfully! Your personalized schedule is ready.")
     
     # -----------------------------
     # RESULTS IN BEAUTIFUL CARDS
@@ -504,7 +573,7 @@ if generate_button:
     
     with col_m1:
         st.metric("📆 Days Remaining", f"{days_remaining} days", 
-                 delta=f"{'⚠️ Urgent' if days_remaining < 7 else '✅ On track'}")
+                 delta=f"{'⚠️ Urgent' if next_exam_days < 7 else '✅ On track'}")
     
     with col_m2:
         st.metric("📚 Total Subjects", f"{len(subjects)}")
@@ -525,7 +594,7 @@ if generate_button:
     st.markdown("<h4 style='color: #1a1a2e; margin-bottom: 1rem;'>📅 Daily Study Allocation</h4>", unsafe_allow_html=True)
     
     # Style the dataframe
-    styled_df = df.style\
+    styled_df = plan.to_dataframe().style\
         .background_gradient(subset=['Daily Allocated Hours'], cmap='Blues')\
         .format({'Daily Allocated Hours': '{:.1f} hrs'})\
         .set_properties(**{
@@ -538,6 +607,27 @@ if generate_button:
     
     st.dataframe(styled_df, use_container_width=True)
     
+    # With staggered exams the split changes from day to day
+    if len(set(exam_dates)) > 1:
+        with st.expander("🗓️ Upcoming days"):
+            upcoming = pd.DataFrame(
+                np.round(daily_hours[:14], 1),
+                columns=subjects,
+                index=pd.date_range(date.today(), periods=min(len(daily_hours), 14)).date
+            )
+            st.caption("Exam dates: " + ", ".join(f"{name} {d:%d %b}" for name, d in zip(subjects, exam_dates)))
+            st.dataframe(upcoming, use_container_width=True)
+
+        # Alternative: total hours chosen for diminishing returns, then laid
+        # out so every subject is covered before its own exam
+        with st.expander("🧮 Deadline-optimized schedule"):
+            totals, schedule = build_optimized_plan(tuple(subjects), tuple(weights), total_hours,
+                                                    tuple(exam_dates), date.today())
+            st.dataframe(totals, use_container_width=True, hide_index=True)
+            by_day = schedule.pivot_table(index="Date", columns="Subject", values="Hours",
+                                          aggfunc="sum", fill_value=0.0)
+            st.dataframe(by_day.head(14), use_container_width=True)
+    
     # -----------------------------
     # DOWNLOAD SECTION
     # -----------------------------
@@ -546,7 +636,7 @@ if generate_button:
     col_d1, col_d2, col_d3 = st.columns([1, 1, 1])
     
     with col_d1:
-        csv = df.to_csv(index=False).encode('utf-8')
+        csv = pdf_jobs.get_csv(plan)
         st.download_button(
             label="📊 Download CSV",
             data=csv,
@@ -556,17 +646,13 @@ if generate_button:
         )
     
     with col_d2:
-        try:
-            pdf_file = generate_pdf(df)
-            st.download_button(
-                label="📄 Download PDF",
-                data=pdf_file,
-                file_name=f"study_plan_{date.today().strftime('%Y%m%d')}.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
-        except:
-            st.button("📄 PDF (Coming Soon)", disabled=True, use_container_width=True)
+        st.download_button(
+            label="📄 Download PDF",
+            data=lambda: pdf_jobs.get_pdf(pdf_key, plan),
+            file_name=f"study_plan_{date.today().strftime('%Y%m%d')}.pdf",
+            mime="application/pdf",
+            use_container_width=True
+        )
     
     with col_d3:
         st.button("📧 Email Plan", disabled=True, use_container_width=True)
@@ -576,6 +662,8 @@ if generate_button:
     # -----------------------------
     # VISUALIZATIONS
     # -----------------------------
+    from charts import render_time_distribution, render_subject_priority, render_score_gauge
+    
     col_v1, col_v2 = st.columns(2)
     
     with col_v1:
@@ -583,27 +671,8 @@ if generate_button:
         st.markdown("<h4 style='color: #1a1a2e;'>⏲️ Time Distribution</h4>", unsafe_allow_html=True)
         
         # Enhanced pie chart
-        fig1, ax1 = plt.subplots(figsize=(6, 4), facecolor='white')
-        colors = plt.cm.Purples(np.linspace(0.4, 0.8, len(subjects)))
-        wedges, texts, autotexts = ax1.pie(
-            allocated_hours, 
-            labels=subjects, 
-            autopct='%1.1f%%',
-            colors=colors,
-            startangle=90,
-            explode=[0.05] * len(subjects),
-            shadow=True,
-            textprops={'fontsize': 10, 'weight': 'bold'}
-        )
-        
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontsize(9)
-            autotext.set_weight('bold')
-        
-        ax1.axis('equal')
-        plt.tight_layout()
-        st.pyplot(fig1, use_container_width=True)
+        st.image(render_time_distribution(tuple(subjects), tuple(allocated_hours)),
+                 use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col_v2:
@@ -611,22 +680,8 @@ if generate_button:
         st.markdown("<h4 style='color: #1a1a2e;'>📈 Subject Priority</h4>", unsafe_allow_html=True)
         
         # Enhanced bar chart
-        fig2, ax2 = plt.subplots(figsize=(8, 4), facecolor='white')
-        bars = ax2.bar(subjects, allocated_hours, color=colors, edgecolor='white', linewidth=2)
-        
-        # Add value labels on bars
-        for bar, hours in zip(bars, allocated_hours):
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{hours:.1f}h', ha='center', va='bottom', fontweight='bold')
-        
-        ax2.set_xlabel("Subjects", fontsize=11, fontweight='semibold')
-        ax2.set_ylabel("Daily Study Hours", fontsize=11, fontweight='semibold')
-        ax2.set_title("Recommended Daily Hours per Subject", fontsize=12, fontweight='bold')
-        ax2.grid(axis='y', alpha=0.3, linestyle='--')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        st.pyplot(fig2, use_container_width=True)
+        st.image(render_subject_priority(tuple(subjects), tuple(allocated_hours)),
+                 use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     # -----------------------------
@@ -663,43 +718,24 @@ if generate_button:
     st.markdown("<h4 style='color: #1a1a2e;'>🤖 AI Performance Prediction</h4>", unsafe_allow_html=True)
     
     try:
-        model = train_model()
         avg_difficulty = float(np.mean(weights))
-        prediction = model.predict([[total_hours, days_remaining, avg_difficulty]])
-        predicted_score = round(float(prediction[0]), 2)
+        live_model = get_live_model()
+        predicted_score, band = predict_performance(total_hours, days_remaining, avg_difficulty,
+                                                    live_model.last_record_id)
         
         col_p1, col_p2 = st.columns([1, 1])
         
         with col_p1:
             # Create a gauge chart using matplotlib
-            fig3, ax3 = plt.subplots(figsize=(6, 3), facecolor='white')
-            
             # Define colors for gauge
-            if predicted_score < 50:
-                color = '#ff6b6b'
-                status = "⚠️ At Risk"
-            elif predicted_score < 75:
-                color = '#ffd93d'
-                status = "📚 On Track"
-            else:
-                color = '#6bcf7f'
-                status = "🔥 Excellent"
+            color, status = {
+                "At Risk": ('#ff6b6b', "⚠️ At Risk"),
+                "On Track": ('#ffd93d', "📚 On Track"),
+                "Excellent": ('#6bcf7f', "🔥 Excellent"),
+            }[band]
             
             # Create horizontal gauge
-            ax3.barh([0], [predicted_score], color=color, height=0.3)
-            ax3.barh([0], [100], color='#e0e0e0', height=0.3, alpha=0.3)
-            ax3.set_xlim(0, 100)
-            ax3.set_ylim(-0.5, 0.5)
-            ax3.set_yticks([])
-            ax3.set_xticks([0, 25, 50, 75, 100])
-            ax3.set_xlabel('Predicted Score (%)', fontsize=10, fontweight='semibold')
-            
-            # Add value text
-            ax3.text(predicted_score, 0, f'  {predicted_score}%', 
-                    ha='left', va='center', fontsize=12, fontweight='bold')
-            
-            plt.tight_layout()
-            st.pyplot(fig3, use_container_width=True)
+            st.image(render_score_gauge(predicted_score, color), use_container_width=True)
         
         with col_p2:
             st.markdown(f"""
@@ -711,9 +747,9 @@ if generate_button:
             """, unsafe_allow_html=True)
         
         # Recommendation based on score
-        if predicted_score < 50:
+        if band == "At Risk":
             st.error("⚠️ **Critical:** Increase study hours and focus more on weak subjects. Consider using active recall techniques.")
-        elif predicted_score < 75:
+        elif band == "On Track":
             st.warning("📚 **Moderate:** You're on the right track. Stay consistent and practice more problems.")
         else:
             st.success("🎯 **Excellent:** Great preparation level! Keep up the good work and help peers.")
@@ -723,94 +759,146 @@ if generate_button:
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+if generate_button:
+    if len(subjects) == 0:
+        st.error("⚠️ Please enter at least one subject name to generate your study plan.")
+        st.stop()
+    
+    # Keep the generated inputs so later reruns (typing in a field, adding
+    # progress) keep showing this plan from cache instead of rebuilding it
+    st.session_state.plan_inputs = (tuple(subjects), tuple(weights), total_hours, tuple(exam_dates))
+
+if "plan_inputs" in st.session_state:
+    render_results(*st.session_state.plan_inputs, just_generated=generate_button)
+
 # -----------------------------
 # DAILY PROGRESS TRACKER
 # -----------------------------
-st.markdown('<div class="glass-card progress-card">', unsafe_allow_html=True)
-st.markdown("<h4 style='color: white; margin-bottom: 1.5rem;'>📊 Daily Study Progress Tracker</h4>", unsafe_allow_html=True)
-
-col_t1, col_t2 = st.columns([2, 1])
-
-with col_t1:
-    today_hours = st.number_input(
-        "Enter hours studied today",
-        min_value=0.0,
-        max_value=24.0,
-        value=0.0,
-        step=0.5,
-        help="Track your daily study progress",
-        key="progress_input"
-    )
+# Long histories are downsampled to this many points for the chart
+PROGRESS_PLOT_POINTS = 500
 
-with col_t2:
-    st.markdown("<br>", unsafe_allow_html=True)
-    if st.button("➕ Add Today's Progress", use_container_width=True):
-        if "progress_data" not in st.session_state:
-            st.session_state.progress_data = []
-        st.session_state.progress_data.append(today_hours)
-        st.success(f"✅ Added {today_hours} hours to your progress!")
-
-# Display progress chart
-if "progress_data" in st.session_state and len(st.session_state.progress_data) > 0:
-    st.markdown("<h5 style='color: white; margin-top: 1.5rem;'>📈 Your Study Consistency</h5>", unsafe_allow_html=True)
-    
-    progress_df = pd.DataFrame({
-        "Day": range(1, len(st.session_state.progress_data) + 1),
-        "Hours Studied": st.session_state.progress_data
-    })
-    
-    # Enhanced progress chart
-    fig4, ax4 = plt.subplots(figsize=(10, 4), facecolor='none')
-    
-    # Plot line with markers
-    ax4.plot(progress_df["Day"], progress_df["Hours Studied"], 
-            marker='o', linewidth=3, markersize=10, color='white',
-            markerfacecolor='white', markeredgecolor='#667eea', markeredgewidth=2)
-    
-    # Fill area under curve
-    ax4.fill_between(progress_df["Day"], progress_df["Hours Studied"], 
-                     alpha=0.3, color='white')
-    
-    # Add target line
-    ax4.axhline(y=total_hours, color='#ffd93d', linestyle='--', 
-                linewidth=2, label=f'Daily Target ({total_hours}h)')
-    
-    ax4.set_xlabel("Day", fontsize=11, fontweight='semibold', color='white')
-    ax4.set_ylabel("Hours Studied", fontsize=11, fontweight='semibold', color='white')
-    ax4.set_title("Study Consistency Graph", fontsize=12, fontweight='bold', color='white')
-    ax4.legend(loc='upper left', facecolor='none', edgecolor='white', labelcolor='white')
-    ax4.grid(True, alpha=0.2, linestyle='--', color='white')
-    
-    # Style ticks
-    ax4.tick_params(colors='white')
-    for spine in ax4.spines.values():
-        spine.set_edgecolor('white')
-        spine.set_alpha(0.3)
-    
-    plt.tight_layout()
-    st.pyplot(fig4, use_container_width=True)
-    
-    # Progress summary
-    total_studied = sum(st.session_state.progress_data)
-    avg_studied = np.mean(st.session_state.progress_data)
-    target_achievement = (total_studied / (total_hours * len(st.session_state.progress_data))) * 100
-    
-    col_s1, col_s2, col_s3 = st.columns(3)
-    
-    with col_s1:
-        st.metric("📊 Total Hours", f"{total_studied:.1f}h", 
-                 delta=f"{total_studied - (total_hours * len(st.session_state.progress_data)):.1f}h vs target")
-    
-    with col_s2:
-        st.metric("📈 Daily Average", f"{avg_studied:.1f}h",
-                 delta=f"{avg_studied - total_hours:.1f}h vs target")
-    
-    with col_s3:
-        st.metric("🎯 Target Achievement", f"{target_achievement:.1f}%")
-else:
-    st.info("📝 No progress tracked yet. Start by adding your study hours for today!")
+# A fragment: adding progress only reruns this section, not the plan above
+@st.fragment
+def progress_tracker(total_hours):
+    st.markdown('<div class="glass-card progress-card">', unsafe_allow_html=True)
+    st.markdown("<h4 style='color: white; margin-bottom: 1.5rem;'>📊 Daily Study Progress Tracker</h4>", unsafe_allow_html=True)
+
+    progress_store = get_progress_store()
+    tracker_user = st.text_input(
+        "Tracker profile",
+        value="default",
+        help="Your progress is saved under this name",
+        key="tracker_user"
+    ).strip() or "default"
+
+    col_t1, col_t2 = st.columns([2, 1])
+
+    with col_t1:
+        today_hours = st.number_input(
+            "Enter hours studied today",
+            min_value=0.0,
+            max_value=24.0,
+            value=0.0,
+            step=0.5,
+            help="Track your daily study progress",
+            key="progress_input"
+        )
 
-st.markdown('</div>', unsafe_allow_html=True)
+    with col_t2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("➕ Add Today's Progress", use_container_width=True):
+            progress_store.add(tracker_user, today_hours)
+            st.success(f"✅ Added {today_hours} hours to your progress!")
+
+    # Display progress chart
+    progress_stats = progress_store.stats(tracker_user)
+    tracked_hours = total_hours
+    if progress_stats["count"] > 0:
+        st.markdown("<h5 style='color: white; margin-top: 1.5rem;'>📈 Your Study Consistency</h5>", unsafe_allow_html=True)
+    
+        logged_on, hours_logged = progress_store.history(tracker_user)
+        days_left = (calculate_days_remaining(max(st.session_state.plan_inputs[3]))
+                     if "plan_inputs" in st.session_state else 0)
+        summary = analytics.summarize(logged_on, hours_logged, total_hours, days_left)
+
+        # One point per calendar day, thinned out for long histories
+        daily = summary["daily"]
+        keep = analytics.lttb(np.arange(len(daily)), daily, PROGRESS_PLOT_POINTS)
+    
+        # Enhanced progress chart
+        from charts import render_progress
+    
+        st.image(render_progress(tuple((keep + 1).tolist()), tuple(daily[keep].tolist()), total_hours,
+                                 tuple(summary["rolling_7"][keep].tolist())),
+                 use_container_width=True)
+    
+        # Progress summary, per calendar day with study time like the
+        # rolling averages and streaks below
+        total_studied = progress_stats["total"]
+        active_days = summary["active_days"]
+        avg_studied = total_studied / active_days if active_days else 0.0
+        target_total = total_hours * active_days
+        target_achievement = (total_studied / target_total) * 100 if target_total else 0.0
+        if active_days:
+            tracked_hours = avg_studied
+    
+        col_s1, col_s2, col_s3, col_s4 = st.columns(4)
+    
+        with col_s1:
+            st.metric("📊 Total Hours", f"{total_studied:.1f}h", 
+                     delta=f"{total_studied - target_total:.1f}h vs target")
+    
+        with col_s2:
+            st.metric("📈 Daily Average", f"{avg_studied:.1f}h",
+                     delta=f"{avg_studied - total_hours:.1f}h vs target")
+    
+        with col_s3:
+            st.metric("🎯 Target Achievement", f"{target_achievement:.1f}%")
+    
+        with col_s4:
+            st.metric("🔥 Current Streak", f"{progress_stats['streak']} days")
+
+        col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+
+        with col_r1:
+            st.metric("📅 7-Day Average", f"{summary['mean_7']:.1f}h",
+                     delta=f"{summary['mean_7'] - total_hours:.1f}h vs target")
+
+        with col_r2:
+            st.metric("🗓️ 30-Day Average", f"{summary['mean_30']:.1f}h",
+                     delta=f"{summary['mean_30'] - total_hours:.1f}h vs target")
+
+        with col_r3:
+            st.metric("🏆 Longest Streak", f"{summary['longest_streak']} days")
+
+        with col_r4:
+            st.metric("🎓 Exam Progress", f"{summary['exam_progress'] * 100:.1f}%")
+    else:
+        st.info("📝 No progress tracked yet. Start by adding your study hours for today!")
+
+    # Logged scores train the prediction model on real outcomes
+    if "plan_inputs" in st.session_state:
+        _, plan_weights, _, plan_exam_dates = st.session_state.plan_inputs
+        with st.expander("📝 Log a mock test score"):
+            mock_score = st.number_input("Score (%)", min_value=0.0, max_value=100.0,
+                                         value=70.0, step=1.0, key="mock_score")
+            if st.button("Save Score", use_container_width=True):
+                from model_registry import refresh_incremental_model
+
+                progress_store.add_outcome(
+                    tracker_user,
+                    tracked_hours,
+                    calculate_days_remaining(max(plan_exam_dates)),
+                    float(np.mean(plan_weights)),
+                    mock_score,
+                )
+                refresh_incremental_model(get_live_model(), progress_store)
+                # Full rerun so the prediction above picks up the refit model
+                st.rerun()
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+progress_tracker(total_hours)
 
 # -----------------------------
 # FOOTER
@@ -830,4 +918,29 @@ st.markdown("""
     </p>
 </div>
 
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# -----------------------------
+# DEBUG - PIPELINE TIMINGS
+# -----------------------------
+if tracing.enabled():
+    stage_stats = tracing.summary()
+    with st.sidebar:
+        with st.expander("🛠️ Pipeline Timings", expanded=False):
+            if stage_stats:
+                timings_df = pd.DataFrame([
+                    {
+                        "Stage": name,
+                        "Calls": stage["count"],
+                        "p50 (ms)": stage["p50"] * 1000,
+                        "p95 (ms)": stage["p95"] * 1000,
+                        "p99 (ms)": stage["p99"] * 1000,
+                        "Peak Mem (MB)": stage["peak_memory"] / 1e6,
+                    }
+                    for name, stage in stage_stats.items()
+                ])
+                st.dataframe(timings_df.style.format(precision=2), hide_index=True, use_container_width=True)
+            else:
+                st.caption("No spans recorded yet.")
+    if tracing.METRICS_FILE:
+        tracing.write_prometheus(tracing.METRICS_FILE)
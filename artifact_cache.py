@@ -0,0 +1,165 @@
+"""
+Content-addressed cache of rendered artifacts (PDFs, CSVs) on local disk.
+
+Files are named by a key derived from what was rendered, so any process
+that renders the same plan on the same day can reuse the bytes. The
+directory is kept under a size budget by evicting the least recently used
+files: a cache hit bumps the file's mtime, and eviction removes the oldest
+mtimes first. Writes go through a temp file and a rename, so concurrent
+readers and writers (app threads, API workers) never see partial files.
+"""
+import os
+import tempfile
+import threading
+
+CACHE_DIR = os.environ.get(
+    "STUDY_PLANNER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"),
+)
+CACHE_MAX_BYTES = int(float(os.environ.get("STUDY_PLANNER_CACHE_MAX_MB", "256")) * 2**20)
+# Eviction trims down to this fraction of the budget, so it doesn't rerun
+# on every write once the cache is full
+LOW_WATER = 0.8
+
+
+class ArtifactCache:
+    """
+    A directory of ``<key><suffix>`` files with LRU eviction. Set
+    ``max_bytes`` to 0 to disable the cache.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # bytes on disk, counted on the first write
+
+    def path(self, key, suffix=""):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def get(self, key, suffix=""):
+        """
+        Cached bytes for ``key``, or None
+        """
+        if self.max_bytes <= 0:
+            return None
+        path = self.path(key, suffix)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            # Missing, evicted between the read and the touch, or an
+            # unreadable/read-only cache, which only costs us the reuse
+            return None
+        return data
+
+    def put(self, key, data, suffix=""):
+        """
+        Store ``data`` under ``key``. Best-effort: if the directory can't be
+        written the bytes are simply not cached.
+        """
+        if self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return
+        path = self.path(key, suffix)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError:
+            _remove(tmp_path)
+            return
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_or_create(self, key, create, suffix=""):
+        """
+        Cached bytes for ``key``, calling ``create()`` and storing its result
+        on a miss. Cache errors fall back to ``create()``.
+        """
+        data = self.get(key, suffix)
+        if data is None:
+            data = create()
+            self.put(key, data, suffix)
+        return data
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._entries():
+                _remove(path)
+            self._size = 0
+
+    def _entries(self):
+        """
+        (mtime, size, path) of every cached file, oldest first
+        """
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".tmp") or not entry.is_file():
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        entries.sort()
+        return entries
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Other processes share the directory, so recount from disk rather
+        # than trusting this process's running total
+        entries = self._entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * LOW_WATER
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            _remove(path)
+            size -= entry_size
+        self._size = size
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+_default = None
+_default_lock = threading.Lock()
+
+def get_cache():
+    """
+    The process-wide cache for CACHE_DIR
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ArtifactCache()
+        return _default
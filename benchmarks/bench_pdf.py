@@ -0,0 +1,56 @@
+"""
+Per-PDF latency with and without the cached PDFTemplate.
+
+    python benchmarks/bench_pdf.py [--runs 200] [--subjects 5]
+
+"rebuild" drops the thread's template before every document, which is the
+cost generate_pdf paid before templates were cached.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_generator
+from planner import generate_study_plan
+
+def _time(fns, runs):
+    """
+    Run the candidates interleaved so machine noise hits them equally
+    """
+    samples = {name: [] for name in fns}
+    for _ in range(runs):
+        for name, fn in fns.items():
+            start = time.perf_counter()
+            fn()
+            samples[name].append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--subjects", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    subjects = [f"Subject {i + 1}" for i in range(args.subjects)]
+    weights = [3, 2, 1] * (args.subjects // 3 + 1)
+    df, _ = generate_study_plan(subjects, weights[:args.subjects], 6)
+
+    def rebuild():
+        pdf_generator._local.template = None
+        pdf_generator.generate_pdf(df)
+
+    def cached():
+        pdf_generator.generate_pdf(df)
+
+    cached()  # warm up imports and font metrics
+    samples = _time({"rebuild": rebuild, "cached": cached}, args.runs)
+    for name, values in samples.items():
+        print(f"{name:<8} median {statistics.median(values):7.2f} ms   "
+              f"mean {statistics.mean(values):7.2f} ms")
+
+if __name__ == "__main__":
+    main()
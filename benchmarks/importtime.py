@@ -0,0 +1,80 @@
+"""
+Cold-start import report for app.py, based on ``python -X importtime``.
+
+    python benchmarks/importtime.py [--top 15] [--json report.json]
+
+Runs the app once in Streamlit's bare mode (no server, no button presses)
+and reports what its startup imported. Exits with status 1 if any module in
+LAZY_MODULES was imported at startup, so it can gate CI as a regression check.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies that must only load when their feature is used
+LAZY_MODULES = ("matplotlib", "reportlab", "sklearn", "scipy")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def collect(script="app.py"):
+    """
+    Return [(module, self_us, cumulative_us, depth)] for one cold run
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["STUDY_PLANNER_DB"] = os.path.join(tmp, "progress.db")
+        env["STUDY_PLANNER_MODEL_DIR"] = os.path.join(tmp, "models")
+        env.pop("STUDY_PLANNER_TRACE", None)
+        proc = subprocess.run([sys.executable, "-X", "importtime", script],
+                              cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script} failed to start:\n{proc.stderr[-2000:]}")
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return imports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report app.py cold-start imports")
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list")
+    parser.add_argument("--json", help="also write the report to this path")
+    args = parser.parse_args(argv)
+
+    imports = collect()
+    top_level = sorted((i for i in imports if i[3] == 0), key=lambda i: -i[2])
+    total_ms = sum(i[2] for i in top_level) / 1000
+    loaded = {module for module, *_ in imports}
+    violations = sorted(m for m in LAZY_MODULES if m in loaded)
+
+    print(f"Startup imports: {len(imports)} modules, {total_ms:.0f} ms cumulative\n")
+    print(f"{'module':<40} {'cumulative':>12}")
+    for module, _, cumulative_us, _ in top_level[:args.top]:
+        print(f"{module:<40} {cumulative_us / 1000:9.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "total_ms": total_ms,
+                "modules": len(imports),
+                "top_level": [{"module": m, "cumulative_ms": c / 1000} for m, _, c, _ in top_level],
+                "lazy_violations": violations,
+            }, f, indent=2)
+
+    if violations:
+        print(f"\n❌ Imported at startup but should be lazy: {', '.join(violations)}")
+        return 1
+    print(f"\n✅ None of {', '.join(LAZY_MODULES)} imported at startup")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Benchmark suite for the planner, model, PDF and chart hot paths.
+
+    python benchmarks/run.py                      # run all, save JSON
+    python benchmarks/run.py -k pdf               # only names containing "pdf"
+    python benchmarks/run.py --compare benchmarks/results/<sha>.json
+
+Results go to benchmarks/results/<git commit>.json (or --output). With
+--compare, every benchmark is listed next to the baseline and the run exits
+with status 1 if any got slower than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+BENCHMARKS = []
+
+def benchmark(name, params=(None,)):
+    """
+    Register ``setup(param) -> callable`` as a benchmark, once per param
+    """
+    def register(setup):
+        for param in params:
+            BENCHMARKS.append((name if param is None else f"{name}[{param}]", setup, param))
+        return setup
+    return register
+
+# -----------------------------
+# PLANNER
+# -----------------------------
+@benchmark("planner.generate_study_plan", params=(1, 10, 100, 1000, 10000))
+def _plan(n_subjects):
+    from planner import generate_study_plan
+
+    subjects = [f"Subject {i}" for i in range(n_subjects)]
+    weights = list(np.resize([3, 2, 1], n_subjects))
+    return lambda: generate_study_plan(subjects, weights, 6)
+
+@benchmark("planner.build_study_plan", params=(1, 10, 100, 1000, 10000))
+def _study_plan(n_subjects):
+    from planner import build_study_plan
+
+    subjects = [f"Subject {i}" for i in range(n_subjects)]
+    weights = list(np.resize([3, 2, 1], n_subjects))
+    return lambda: build_study_plan(subjects, weights, 6)
+
+@benchmark("planner.generate_urgency_plans_batch", params=(100, 10000))
+def _urgency(n_students):
+    from planner import generate_urgency_plans_batch
+
+    rng = np.random.default_rng(0)
+    offsets = np.concatenate(([0], np.cumsum(rng.integers(3, 8, n_students))))
+    weights = rng.integers(1, 4, offsets[-1])
+    exam_days = rng.integers(1, 61, offsets[-1])
+    return lambda: generate_urgency_plans_batch(weights, exam_days, offsets, 4)
+
+@benchmark("optimizer.optimize_allocation", params=(100, 10000))
+def _optimize(n_students):
+    from optimizer import optimize_allocation
+
+    rng = np.random.default_rng(0)
+    counts = rng.integers(3, 8, n_students)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    weights = rng.integers(1, 4, offsets[-1])
+    exam_days = rng.integers(5, 61, offsets[-1])
+    availability = rng.uniform(1, 8, (n_students, 60))
+    return lambda: optimize_allocation(weights, exam_days, offsets, availability)
+
+# -----------------------------
+# ML MODEL
+# -----------------------------
+@benchmark("ml_model.train_model")
+def _train(_):
+    from ml_model import train_model
+
+    return train_model
+
+@benchmark("ml_model.predict")
+def _predict(_):
+    from ml_model import train_model
+
+    model = train_model()
+    return lambda: model.predict([[4, 30, 2.0]])
+
+@benchmark("ml_model.LinearPredictor.predict", params=(1, 1000, 100000))
+def _predictor(n_rows):
+    from ml_model import LinearPredictor, train_model
+
+    predictor = LinearPredictor.from_model(train_model())
+    X = np.random.default_rng(0).uniform(1, 10, (n_rows, 3))
+    return lambda: predictor.predict(X)
+
+@benchmark("ml_model.predict_batch", params=(1, 1000, 100000))
+def _predict_batch(n_rows):
+    from ml_model import predict_batch, train_model
+
+    model = train_model()
+    X = np.random.default_rng(0).uniform(1, 10, (n_rows, 3))
+    return lambda: predict_batch(X, model)
+
+# -----------------------------
+# PDF
+# -----------------------------
+@benchmark("pdf_generator.generate_pdf", params=(1, 10, 50, 1000))
+def _pdf(n_rows):
+    from pdf_generator import generate_pdf
+    from planner import generate_study_plan
+
+    df, _ = generate_study_plan([f"Subject {i}" for i in range(n_rows)],
+                                list(np.resize([3, 2, 1], n_rows)), 6)
+    return lambda: generate_pdf(df)
+
+# -----------------------------
+# PROGRESS ANALYTICS
+# -----------------------------
+def _history(n):
+    rng = np.random.default_rng(0)
+    days = np.datetime64("2020-01-01") + np.sort(rng.integers(0, n, n))
+    return days, rng.uniform(0, 6, n)
+
+@benchmark("analytics.summarize", params=(365, 10000, 1000000))
+def _summarize(n):
+    import analytics
+
+    days, hours = _history(n)
+    return lambda: analytics.summarize(days, hours, 4, 30)
+
+@benchmark("analytics.lttb", params=(10000, 1000000))
+def _lttb(n):
+    import analytics
+
+    x, y = np.arange(n), np.random.default_rng(0).uniform(0, 6, n)
+    return lambda: analytics.lttb(x, y, 500)
+
+# -----------------------------
+# CHARTS (uncached render cost)
+# -----------------------------
+@benchmark("charts.render_time_distribution", params=(3, 10))
+def _pie(n):
+    import charts
+
+    subjects, hours = tuple(f"S{i}" for i in range(n)), tuple(np.linspace(1, 3, n))
+    return lambda: charts.render_time_distribution.__wrapped__(subjects, hours)
+
+@benchmark("charts.render_subject_priority", params=(3, 10))
+def _bar(n):
+    import charts
+
+    subjects, hours = tuple(f"S{i}" for i in range(n)), tuple(np.linspace(1, 3, n))
+    return lambda: charts.render_subject_priority.__wrapped__(subjects, hours)
+
+@benchmark("charts.render_score_gauge")
+def _gauge(_):
+    import charts
+
+    return lambda: charts.render_score_gauge.__wrapped__(62.5, '#ffd93d')
+
+@benchmark("charts.render_progress", params=(30, 365))
+def _progress(n):
+    import charts
+
+    days = tuple(range(1, n + 1))
+    hours = tuple(np.random.default_rng(0).uniform(0, 6, n))
+    return lambda: charts.render_progress.__wrapped__(days, hours, 4)
+
+
+def measure(fn, min_time=0.2, repeat=5):
+    """
+    asv-style timing: pick a loop count that runs for ``min_time`` seconds,
+    then take ``repeat`` samples of seconds per call
+    """
+    fn()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "number": number,
+        "repeat": repeat,
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+def compare(results, baseline, threshold):
+    """
+    Print current vs baseline medians; return the names that regressed
+    """
+    regressions = []
+    old = baseline["benchmarks"]
+    for name, result in results["benchmarks"].items():
+        if name not in old:
+            print(f"{name:<45} {_format_time(result['median'])}   (new)")
+            continue
+        ratio = result["median"] / old[name]["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  ⚠️ slower"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  ✅ faster"
+        print(f"{name:<45} {_format_time(old[name]['median'])} -> "
+              f"{_format_time(result['median'])}  x{ratio:5.2f}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("-o", "--output", help="results JSON path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per sample")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per benchmark")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    results = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "benchmarks": {},
+    }
+
+    for name, setup, param in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        result = measure(setup(param), args.min_time, args.repeat)
+        results["benchmarks"][name] = result
+        print(f"{name:<45} {_format_time(result['median'])}  ({result['number']} loops x {result['repeat']})")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline.get('commit', args.compare)}:")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Chart rendering for the planner UI.
+
+Every chart is rendered to PNG bytes on the non-interactive Agg backend,
+closed straight away and memoized, so reruns with the same inputs cost a
+dictionary lookup and long-lived servers don't accumulate pyplot figures.
+Arguments must be hashable (pass tuples, not lists). Tracing spans only
+cover actual renders, not cache hits.
+"""
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from tracing import traced
+
+CACHE_SIZE = 256
+
+# Same output settings st.pyplot uses
+SAVEFIG_OPTIONS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+# pyplot keeps global state, so only one thread draws at a time
+_render_lock = threading.Lock()
+
+@contextmanager
+def _figure(**kwargs):
+    """
+    ``plt.subplots(**kwargs)`` that always closes the figure, even when
+    plotting raises
+    """
+    fig, ax = plt.subplots(**kwargs)
+    try:
+        yield fig, ax
+    finally:
+        plt.close(fig)
+
+def _to_png(fig):
+    buffer = BytesIO()
+    fig.savefig(buffer, **SAVEFIG_OPTIONS)
+    return buffer.getvalue()
+
+def _subject_colors(n):
+    return plt.cm.Purples(np.linspace(0.4, 0.8, n))
+
+@lru_cache(maxsize=CACHE_SIZE)
+@traced("charts.render_time_distribution")
+def render_time_distribution(subjects, allocated_hours):
+    """
+    Pie chart of each subject's share of the daily hours
+    """
+    with _render_lock, _figure(figsize=(6, 4), facecolor='white') as (fig1, ax1):
+        wedges, texts, autotexts = ax1.pie(
+            allocated_hours,
+            labels=subjects,
+            autopct='%1.1f%%',
+            colors=_subject_colors(len(subjects)),
+            startangle=90,
+            explode=[0.05] * len(subjects),
+            shadow=True,
+            textprops={'fontsize': 10, 'weight': 'bold'}
+        )
+
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontsize(9)
+            autotext.set_weight('bold')
+
+        ax1.axis('equal')
+        fig1.tight_layout()
+        return _to_png(fig1)
+
+@lru_cache(maxsize=CACHE_SIZE)
+@traced("charts.render_subject_priority")
+def render_subject_priority(subjects, allocated_hours):
+    """
+    Bar chart of daily hours per subject
+    """
+    with _render_lock, _figure(figsize=(8, 4), facecolor='white') as (fig2, ax2):
+        bars = ax2.bar(subjects, allocated_hours, color=_subject_colors(len(subjects)),
+                       edgecolor='white', linewidth=2)
+
+        # Add value labels on bars
+        for bar, hours in zip(bars, allocated_hours):
+            height = bar.get_height()
+            ax2.text(bar.get_x() + bar.get_width()/2., height,
+                    f'{hours:.1f}h', ha='center', va='bottom', fontweight='bold')
+
+        ax2.set_xlabel("Subjects", fontsize=11, fontweight='semibold')
+        ax2.set_ylabel("Daily Study Hours", fontsize=11, fontweight='semibold')
+        ax2.set_title("Recommended Daily Hours per Subject", fontsize=12, fontweight='bold')
+        ax2.grid(axis='y', alpha=0.3, linestyle='--')
+        plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
+        fig2.tight_layout()
+        return _to_png(fig2)
+
+@lru_cache(maxsize=CACHE_SIZE)
+@traced("charts.render_score_gauge")
+def render_score_gauge(predicted_score, color):
+    """
+    Horizontal gauge of the predicted score (0-100)
+    """
+    with _render_lock, _figure(figsize=(6, 3), facecolor='white') as (fig3, ax3):
+        # Create horizontal gauge
+        ax3.barh([0], [predicted_score], color=color, height=0.3)
+        ax3.barh([0], [100], color='#e0e0e0', height=0.3, alpha=0.3)
+        ax3.set_xlim(0, 100)
+        ax3.set_ylim(-0.5, 0.5)
+        ax3.set_yticks([])
+        ax3.set_xticks([0, 25, 50, 75, 100])
+        ax3.set_xlabel('Predicted Score (%)', fontsize=10, fontweight='semibold')
+
+        # Add value text
+        ax3.text(predicted_score, 0, f'  {predicted_score}%',
+                ha='left', va='center', fontsize=12, fontweight='bold')
+
+        fig3.tight_layout()
+        return _to_png(fig3)
+
+@lru_cache(maxsize=CACHE_SIZE)
+@traced("charts.render_progress")
+def render_progress(days, hours_studied, target_hours, rolling=None):
+    """
+    Study consistency line chart against the daily target, optionally with
+    a rolling average. Long histories should be downsampled first
+    (analytics.lttb) since every point is drawn.
+    """
+    with _render_lock, _figure(figsize=(10, 4), facecolor='none') as (fig4, ax4):
+        # Plot line, with markers while they stay legible
+        marker_size = 10 if len(days) <= 60 else 0
+        ax4.plot(days, hours_studied,
+                marker='o', linewidth=3, markersize=marker_size, color='white',
+                markerfacecolor='white', markeredgecolor='#667eea', markeredgewidth=2)
+
+        # Fill area under curve
+        ax4.fill_between(days, hours_studied,
+                         alpha=0.3, color='white')
+
+        if rolling is not None:
+            ax4.plot(days, rolling, linewidth=2, color='#6bcf7f', label='7-Day Average')
+
+        # Add target line
+        ax4.axhline(y=target_hours, color='#ffd93d', linestyle='--',
+                    linewidth=2, label=f'Daily Target ({target_hours}h)')
+
+        ax4.set_xlabel("Day", fontsize=11, fontweight='semibold', color='white')
+        ax4.set_ylabel("Hours Studied", fontsize=11, fontweight='semibold', color='white')
+        ax4.set_title("Study Consistency Graph", fontsize=12, fontweight='bold', color='white')
+        ax4.legend(loc='upper left', facecolor='none', edgecolor='white', labelcolor='white')
+        ax4.grid(True, alpha=0.2, linestyle='--', color='white')
+
+        # Style ticks
+        ax4.tick_params(colors='white')
+        for spine in ax4.spines.values():
+            spine.set_edgecolor('white')
+            spine.set_alpha(0.3)
+
+        fig4.tight_layout()
+        return _to_png(fig4)
+
+def clear_cache():
+    for render in (render_time_distribution, render_subject_priority,
+                   render_score_gauge, render_progress):
+        render.cache_clear()
@@ -0,0 +1,206 @@
+"""
+Headless bulk generation of study plans and PDFs.
+
+    python cli.py students.csv -o plans/
+    python cli.py students.jsonl -o plans.zip --workers 8
+
+Each input record needs ``subjects``, ``difficulties`` (Weak / Medium /
+Strong), ``daily_hours`` and ``exam_date`` (YYYY-MM-DD), plus an optional
+``name``. In CSV files the subject and difficulty columns are
+semicolon-separated lists; in JSONL they may also be JSON arrays.
+
+PDFs go through the on-disk artifact cache, so students with identical
+plans (common in templated cohorts) are rendered once.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from io import StringIO
+from itertools import islice
+
+from planner import DIFFICULTY_MAP, build_study_plan
+from utils import calculate_days_remaining
+from pdf_jobs import render_pdf
+
+MAX_DAILY_HOURS = 24
+# Chunks queued per worker; bounds how far reading runs ahead of rendering
+CHUNKS_PER_WORKER = 2
+# Set by read_students on records it could not parse
+PARSE_ERROR = "_parse_error"
+
+INDEX_FIELDS = ["name", "file", "subjects", "daily_hours", "days_remaining", "error"]
+
+def split_field(value):
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(";") if v.strip()]
+    return [str(v).strip() for v in value]
+
+def read_students(path):
+    """
+    Yield student records from a .csv or .jsonl file. A JSONL line that is
+    not a JSON object still yields a record, carrying PARSE_ERROR, so it is
+    reported as one failed student rather than ending the run.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    record = {PARSE_ERROR: f"line {line_no}: invalid JSON ({e})"}
+                if not isinstance(record, dict):
+                    record = {PARSE_ERROR: f"line {line_no}: expected a JSON object"}
+                yield record
+        else:
+            yield from csv.DictReader(f)
+
+def parse_student(record, require_exam_date=True):
+    """
+    Validate one student record. Returns (subjects, weights, daily_hours,
+    exam_date); exam_date is None when it is optional and missing.
+    """
+    if PARSE_ERROR in record:
+        raise ValueError(record[PARSE_ERROR])
+    subjects = split_field(record["subjects"])
+    difficulties = split_field(record["difficulties"])
+    if not subjects or len(subjects) != len(difficulties):
+        raise ValueError("subjects and difficulties must be non-empty and the same length")
+    unknown = [d for d in difficulties if d.title() not in DIFFICULTY_MAP]
+    if unknown:
+        raise ValueError(f"unknown difficulty {unknown[0]!r}, expected one of {', '.join(DIFFICULTY_MAP)}")
+    weights = [DIFFICULTY_MAP[d.title()] for d in difficulties]
+    daily_hours = float(record["daily_hours"])
+    if not 0 < daily_hours <= MAX_DAILY_HOURS:
+        raise ValueError(f"daily_hours must be more than 0 and at most {MAX_DAILY_HOURS}")
+    if require_exam_date or record.get("exam_date"):
+        exam_date = date.fromisoformat(str(record["exam_date"]))
+    else:
+        exam_date = None
+    return subjects, weights, daily_hours, exam_date
+
+def _file_name(index, name):
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "student"
+    return f"{index:06d}_{slug[:60]}.pdf"
+
+def render_student(job):
+    """
+    Build one student's plan and PDF. Runs inside a worker process; writes
+    straight to ``out_dir`` when given, otherwise returns the PDF bytes.
+    """
+    index, record, out_dir = job
+    name = str(record.get("name") or f"student_{index}")
+    row = {"name": name, "file": _file_name(index, name)}
+    try:
+        subjects, weights, daily_hours, exam_date = parse_student(record)
+
+        plan = build_study_plan(subjects, weights, daily_hours)
+        days_remaining = calculate_days_remaining(exam_date)
+        pdf_bytes = render_pdf(plan)
+    except Exception as e:
+        row["file"] = ""
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row, None
+
+    row.update(subjects=len(subjects), daily_hours=daily_hours, days_remaining=days_remaining)
+    if out_dir is not None:
+        with open(os.path.join(out_dir, row["file"]), "wb") as f:
+            f.write(pdf_bytes)
+        return row, None
+    return row, pdf_bytes
+
+def render_chunk(jobs):
+    return [render_student(job) for job in jobs]
+
+def _map_bounded(executor, jobs, chunksize, window):
+    """
+    ``executor.map(render_student, jobs, chunksize=chunksize)``, except that
+    at most ``window`` chunks are in flight, so ``jobs`` is consumed as
+    results come back rather than all up front
+    """
+    jobs = iter(jobs)
+    pending = deque()
+    while True:
+        while len(pending) < window:
+            chunk = list(islice(jobs, chunksize))
+            if not chunk:
+                break
+            pending.append(executor.submit(render_chunk, chunk))
+        if not pending:
+            return
+        yield from pending.popleft().result()
+
+def run(input_path, output, workers=None, chunksize=32):
+    """
+    Render every student in ``input_path`` into ``output`` (a directory, or a
+    zip archive when it ends in .zip). Returns the number of failed records.
+
+    Records are read as workers free up, ``chunksize`` at a time, so memory
+    stays flat however long the input is.
+    """
+    to_zip = output.lower().endswith(".zip")
+    out_dir = None
+    if to_zip:
+        parent = os.path.dirname(os.path.abspath(output))
+        os.makedirs(parent, exist_ok=True)
+        archive = zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED)
+    else:
+        out_dir = output
+        os.makedirs(out_dir, exist_ok=True)
+        archive = None
+
+    jobs = ((i, record, out_dir) for i, record in enumerate(read_students(input_path)))
+    failures = 0
+    index_rows = []
+    try:
+        window = (workers or os.cpu_count() or 1) * CHUNKS_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for row, pdf_bytes in _map_bounded(executor, jobs, chunksize, window):
+                if row.get("error"):
+                    failures += 1
+                    print(f"✗ {row['name']}: {row['error']}", file=sys.stderr)
+                elif archive is not None:
+                    archive.writestr(row["file"], pdf_bytes)
+                index_rows.append(row)
+
+        index_buffer = _index_csv(index_rows)
+        if archive is not None:
+            archive.writestr("index.csv", index_buffer)
+        else:
+            with open(os.path.join(out_dir, "index.csv"), "w", encoding="utf-8", newline="") as f:
+                f.write(index_buffer)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    print(f"✅ {len(index_rows) - failures} PDFs written to {output} ({failures} failed)")
+    return failures
+
+def _index_csv(rows):
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=INDEX_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-generate study plan PDFs")
+    parser.add_argument("input", help="students .csv or .jsonl file")
+    parser.add_argument("-o", "--output", required=True, help="output directory or .zip path")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=32,
+                        help="students handed to a worker at a time")
+    args = parser.parse_args(argv)
+    return 1 if run(args.input, args.output, args.workers, args.chunksize) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Streaming exporters for timetables.
+
+Both writers work straight from Timetable arrays and write incrementally, so
+no DataFrame of the whole plan (or cohort) is ever built.
+"""
+import hashlib
+from datetime import datetime, time, timedelta, timezone
+
+import numpy as np
+
+ICS_PRODID = "-//AI Study Planner Pro//Study Timetable//EN"
+
+def study_blocks(timetable):
+    """
+    Merge consecutive slots of the same subject on the same day.
+
+    Returns (day, first_slot, subject, num_slots) arrays, one entry per block.
+    """
+    day, subject = timetable.day, timetable.subject
+    if len(day) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    starts = np.flatnonzero(np.concatenate(([True], (day[1:] != day[:-1]) | (subject[1:] != subject[:-1]))))
+    lengths = np.diff(np.concatenate((starts, [len(day)])))
+    return day[starts], timetable.slot[starts], subject[starts], lengths
+
+def _ics_escape(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+def _ics_fold(line):
+    # RFC 5545 lines are at most 75 octets; continuation lines start with a space
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    while data:
+        cut = min(len(data), 75 if not parts else 74)
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+    return "\r\n ".join(parts) + "\r\n"
+
+def write_ics(timetable, sink, day_start=time(9, 0), break_minutes=5,
+              calendar_name="AI Study Planner", chunk_size=1024):
+    """
+    Write one VEVENT per study block to ``sink`` (a path or text file object).
+
+    Blocks start at ``day_start`` each day, with ``break_minutes`` between
+    slots. Events are floating local times, so they show at the same clock
+    time in any calendar app. Lines are flushed every ``chunk_size`` events.
+    """
+    own = isinstance(sink, str)
+    f = open(sink, "w", encoding="utf-8", newline="") if own else sink
+    try:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        f.write("".join(_ics_fold(line) for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{ICS_PRODID}",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{_ics_escape(calendar_name)}",
+        )))
+
+        day, first_slot, subject, num_slots = study_blocks(timetable)
+        step = timetable.slot_minutes + break_minutes
+        origin = datetime.combine(timetable.start_date, day_start)
+        start_offsets = day.astype(np.int64) * 1440 + first_slot.astype(np.int64) * step
+        durations = num_slots.astype(np.int64) * step - break_minutes
+        names = [_ics_escape(s) for s in timetable.subjects]
+        digest = hashlib.sha1("\x1f".join(timetable.subjects).encode("utf-8")).hexdigest()[:12]
+        uid_prefix = f"{timetable.start_date:%Y%m%d}-{digest}"
+
+        lines = []
+        for i in range(len(day)):
+            start = origin + timedelta(minutes=int(start_offsets[i]))
+            end = start + timedelta(minutes=int(durations[i]))
+            summary = f"📘 {names[subject[i]]}"
+            if timetable.revision[day[i]]:
+                summary += " (revision)"
+            lines += (
+                "BEGIN:VEVENT\r\n",
+                f"UID:{uid_prefix}-{int(day[i])}-{int(first_slot[i])}@ai-study-planner\r\n",
+                f"DTSTAMP:{stamp}\r\n",
+                f"DTSTART:{start:%Y%m%dT%H%M%S}\r\n",
+                f"DTEND:{end:%Y%m%dT%H%M%S}\r\n",
+                _ics_fold(f"SUMMARY:{summary}"),
+                "END:VEVENT\r\n",
+            )
+            if (i + 1) % chunk_size == 0:
+                f.writelines(lines)
+                lines.clear()
+        f.writelines(lines)
+        f.write("END:VCALENDAR\r\n")
+    finally:
+        if own:
+            f.close()
+    return sink
+
+def _arrow_batch(pa, student_id, timetable):
+    n = len(timetable)
+    return pa.record_batch([
+        pa.array(np.full(n, student_id, dtype=np.int64)),
+        pa.array(timetable.dates()),
+        pa.array(timetable.slot),
+        pa.DictionaryArray.from_arrays(pa.array(timetable.subject.astype(np.int16)),
+                                       pa.array(timetable.subjects, type=pa.string())),
+        pa.array(np.full(n, timetable.slot_minutes, dtype=np.int16)),
+        pa.array(timetable.revision[timetable.day]),
+    ], schema=timetable_schema(pa))
+
+def timetable_schema(pa=None):
+    if pa is None:
+        import pyarrow as pa
+    return pa.schema([
+        ("student", pa.int64()),
+        ("date", pa.date32()),
+        ("slot", pa.int16()),
+        ("subject", pa.dictionary(pa.int16(), pa.string())),
+        ("minutes", pa.int16()),
+        ("revision", pa.bool_()),
+    ])
+
+def write_parquet(timetables, path, row_group_size=1_000_000, compression="zstd"):
+    """
+    Write (student_id, Timetable) pairs to a single Parquet file.
+
+    ``timetables`` may be a generator; slots are buffered only until
+    ``row_group_size`` rows are ready and then written as one row group.
+    Returns the number of rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from e
+
+    schema = timetable_schema(pa)
+    rows = 0
+    pending, pending_rows = [], 0
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+        for student_id, timetable in timetables:
+            batch = _arrow_batch(pa, student_id, timetable)
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= row_group_size:
+                writer.write_table(pa.Table.from_batches(pending, schema), row_group_size=row_group_size)
+                rows += pending_rows
+                pending, pending_rows = [], 0
+        if pending:
+            writer.write_table(pa.Table.from_batches(pending, schema), row_group_size=row_group_size)
+            rows += pending_rows
+    return rows
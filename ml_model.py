@@ -1,19 +1,215 @@
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
-def train_model():
-    np.random.seed(42)
+from tracing import traced
 
-    hours = np.random.randint(1, 10, 100)
-    days = np.random.randint(1, 30, 100)
-    difficulty = np.random.randint(1, 4, 100)
+# Everything that influences the fitted model. The model registry hashes this
+# dict to key saved artifacts, so any change here invalidates old ones.
+TRAINING_CONFIG = {
+    "seed": 42,
+    "n_samples": 100,
+    "hours_range": (1, 10),
+    "days_range": (1, 30),
+    "difficulty_range": (1, 4),
+    "coefficients": (5, 1.5, -3),
+}
 
-    performance = (hours * 5) + (days * 1.5) - (difficulty * 3)
+def make_training_data(config=None):
+    """
+    The synthetic (X, y) dataset described by ``config``
+    """
+    config = TRAINING_CONFIG if config is None else config
+    np.random.seed(config["seed"])
+
+    n = config["n_samples"]
+    hours = np.random.randint(*config["hours_range"], n)
+    days = np.random.randint(*config["days_range"], n)
+    difficulty = np.random.randint(*config["difficulty_range"], n)
+
+    a, b, c = config["coefficients"]
+    performance = (hours * a) + (days * b) + (difficulty * c)
 
     X = np.column_stack((hours, days, difficulty))
     y = performance
+    return X, y
+
+@traced("ml_model.train_model")
+def train_model(config=None):
+    X, y = make_training_data(config)
+
+    # scikit-learn takes about a second to import, so only training pays for it
+    from sklearn.linear_model import LinearRegression
 
     model = LinearRegression()
     model.fit(X, y)
 
     return model
+
+# Feature order the model is trained on
+FEATURES = ("hours", "days", "difficulty")
+
+# Scores below 50 are "At Risk", below 75 "On Track", anything else "Excellent"
+STATUS_THRESHOLDS = np.array([50.0, 75.0])
+STATUS_LABELS = np.array(["At Risk", "On Track", "Excellent"])
+
+def get_coefficients(model):
+    """
+    Return (coef, intercept) so scoring is a plain ``X @ coef + intercept``
+    """
+    return np.asarray(model.coef_, dtype=np.float64), float(model.intercept_)
+
+def score_status(scores):
+    """
+    Map predicted scores to their status band labels
+    """
+    return STATUS_LABELS[np.searchsorted(STATUS_THRESHOLDS, scores, side="right")]
+
+@traced("ml_model.predict_batch")
+def predict_batch(X, model, chunk_size=65536):
+    """
+    Score a cohort of (hours, days, difficulty) rows.
+
+    ``X`` is a 2-D array or a DataFrame. DataFrame columns named after
+    FEATURES are picked by name; otherwise ``X`` must have exactly three
+    columns, taken in FEATURES order. Rows are
+    converted and scored ``chunk_size`` at a time so temporary memory stays
+    bounded. Returns (scores, status_labels).
+    """
+    coef, intercept = get_coefficients(model)
+
+    if hasattr(X, "iloc"):
+        if all(col in X.columns for col in FEATURES):
+            X = X[list(FEATURES)]
+        rows = X.iloc
+    else:
+        X = np.asarray(X)
+        rows = X
+    if X.ndim != 2 or X.shape[1] != len(coef):
+        raise ValueError(f"expected rows of {len(coef)} features {FEATURES}")
+
+    n = X.shape[0]
+    scores = np.empty(n, dtype=np.float64)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk = np.asarray(rows[start:stop], dtype=np.float64)
+        np.dot(chunk, coef, out=scores[start:stop])
+    scores += intercept
+
+    return scores, score_status(scores)
+
+
+class LinearPredictor:
+    """
+    Serving-side linear model: just the fitted weights, scored as
+    ``X @ coef_ + intercept_`` with NumPy only, so serving never imports
+    scikit-learn
+    """
+
+    __slots__ = ("coef_", "intercept_")
+
+    def __init__(self, coef, intercept):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(*get_coefficients(model))
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def to_arrays(self):
+        return {"coef": self.coef_, "intercept": np.float64(self.intercept_)}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays["coef"], arrays["intercept"])
+
+
+class IncrementalLinearModel:
+    """
+    Least-squares model maintained from running sufficient statistics.
+
+    Keeps XᵀX and Xᵀy (with a bias column) so each new batch costs
+    O(rows · features²) and refitting is one small O(features³) solve,
+    independent of how much history has been seen. Exposes ``coef_`` and
+    ``intercept_`` like LinearRegression, so get_coefficients and
+    predict_batch work with it unchanged.
+    """
+
+    def __init__(self, n_features=len(FEATURES), ridge=1e-6):
+        self.ridge = ridge
+        self.xtx = np.zeros((n_features + 1, n_features + 1))
+        self.xty = np.zeros(n_features + 1)
+        self.n_samples = 0.0
+        # Highest progress-store record id already folded in
+        self.last_record_id = 0
+        self.coef_ = np.zeros(n_features)
+        self.intercept_ = 0.0
+
+    def partial_fit(self, X, y, sample_weight=1.0):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(X) == 0:
+            return self
+        Xa = np.column_stack((X, np.ones(len(X))))
+        w = np.broadcast_to(np.asarray(sample_weight, dtype=np.float64), (len(X),))
+        Xw = Xa * w[:, None]
+        self.xtx += Xw.T @ Xa
+        self.xty += Xw.T @ y
+        self.n_samples += float(w.sum())
+        return self.solve()
+
+    def solve(self):
+        # A tiny ridge on the feature weights (not the bias) keeps the
+        # system solvable before the features have varied enough
+        penalty = np.eye(len(self.xty)) * self.ridge * max(self.n_samples, 1.0)
+        penalty[-1, -1] = 0.0
+        w = np.linalg.lstsq(self.xtx + penalty, self.xty, rcond=None)[0]
+        self.coef_, self.intercept_ = w[:-1], float(w[-1])
+        return self
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def predictor(self):
+        return LinearPredictor(self.coef_.copy(), self.intercept_)
+
+    def state(self):
+        return {
+            "xtx": self.xtx,
+            "xty": self.xty,
+            "n_samples": np.float64(self.n_samples),
+            "last_record_id": np.int64(self.last_record_id),
+            "ridge": np.float64(self.ridge),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        model = cls(n_features=len(state["xty"]) - 1, ridge=float(state["ridge"]))
+        model.xtx = np.array(state["xtx"], dtype=np.float64)
+        model.xty = np.array(state["xty"], dtype=np.float64)
+        model.n_samples = float(state["n_samples"])
+        model.last_record_id = int(state["last_record_id"])
+        return model.solve()
+
+def train_incremental_model(config=None, prior_weight=1.0):
+    """
+    Incremental model seeded with the synthetic dataset as a prior; each
+    synthetic row counts as ``prior_weight`` real ones
+    """
+    X, y = make_training_data(config)
+    return IncrementalLinearModel().partial_fit(X, y, sample_weight=prior_weight)
+
+@traced("ml_model.update_from_records")
+def update_from_records(model, chunks):
+    """
+    Fold (last_record_id, X, y) chunks, e.g. from
+    ProgressStore.iter_outcomes(model.last_record_id), into ``model``.
+    Returns the number of new rows.
+    """
+    added = 0
+    for last_id, X, y in chunks:
+        model.partial_fit(X, y)
+        model.last_record_id = max(model.last_record_id, int(last_id))
+        added += len(X)
+    return added
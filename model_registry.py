@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from ml_model import (TRAINING_CONFIG, IncrementalLinearModel, train_incremental_model,
+                      update_from_records)
+from tracing import traced
+
+MODEL_DIR = os.environ.get(
+    "STUDY_PLANNER_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"),
+)
+
+# Serialises refreshes so concurrent sessions don't fold the same outcomes twice
+_refresh_lock = threading.Lock()
+
+def _config_key(config=None):
+    config = TRAINING_CONFIG if config is None else config
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def _atomic_write(path, write):
+    """
+    Write via a temp file and rename so concurrent workers never read a
+    partial file
+    """
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=MODEL_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+def incremental_path(config=None):
+    # Plain arrays keyed by the training config only, so the statistics
+    # survive sklearn upgrades (and loading them doesn't need sklearn at all)
+    return os.path.join(MODEL_DIR, f"incremental_stats_{_config_key(config)}.npz")
+
+def save_incremental_model(model, config=None):
+    return _atomic_write(incremental_path(config), lambda f: np.savez(f, **model.state()))
+
+@traced("model_registry.load_incremental_model")
+def load_incremental_model(config=None):
+    """
+    The incremental model's saved sufficient statistics for ``config``.
+    Training (on the synthetic data, as a prior) only happens when no saved
+    artifact matches, and its result is saved straight away so other
+    processes and later starts reuse it.
+    """
+    path = incremental_path(config)
+    if os.path.exists(path):
+        try:
+            with np.load(path) as state:
+                return IncrementalLinearModel.from_state(state)
+        except (OSError, ValueError, KeyError):
+            pass
+    model = train_incremental_model(config)
+    try:
+        save_incremental_model(model, config)
+    except OSError:
+        # A read-only filesystem only costs us the disk cache
+        pass
+    return model
+
+def refresh_incremental_model(model, store, config=None):
+    """
+    Fold outcomes recorded in ``store`` since the model's last update into
+    it and persist the new statistics. Returns the number of new records.
+
+    Reading the outcomes, fitting them and advancing ``last_record_id``
+    happen under one lock, since the live model is shared between sessions.
+    """
+    with _refresh_lock:
+        added = update_from_records(model, store.iter_outcomes(model.last_record_id))
+        if added:
+            try:
+                save_incremental_model(model, config)
+            except OSError:
+                pass
+    return added
+
+def live_predictor(model):
+    """
+    NumPy-only snapshot of the live incremental ``model``, taken between
+    refreshes so its weights are never half-updated. The app and the API
+    both score with this, so they agree once real outcomes are folded in.
+    """
+    with _refresh_lock:
+        return model.predictor()
@@ -0,0 +1,260 @@
+"""
+Deadline-aware allocation of study hours.
+
+Instead of splitting each day in fixed proportions, this solves, per student,
+
+    maximize    sum_j  w_j * s_j * log(1 + H_j / s_j)
+    subject to  hours for subject j are only studied before its exam,
+                at most ``availability[t]`` hours on day t
+
+where H_j is the total time given to subject j. The log curve gives
+diminishing returns: the marginal value of an hour halves after ``s_j``
+("saturation") hours. Hours therefore go to whichever subject gains most
+from them, and subjects whose exams come first get the early days.
+
+With subjects sorted by exam date, the constraints are nested: the subjects
+due by each exam share the availability before it. The totals are found by
+water-filling over those nested budgets. They are then laid out day by day,
+keeping every later exam feasible while spreading each subject evenly up to
+its exam. Students use the flat weights + CSR offsets layout of
+planner.generate_study_plans_batch and are solved together with NumPy.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from planner import segment_ids
+from tracing import traced
+from utils import days_until
+
+SATURATION_HOURS = 10.0
+MIN_SESSION_HOURS = 0.5
+
+_EPS = 1e-9
+
+
+def _dense(values, rank, ids, n_students, width, fill=0.0):
+    out = np.full((n_students, width), fill, dtype=np.float64)
+    out[ids, rank] = values
+    return out
+
+def _water_fill(w, s, mask, budget):
+    """
+    Water level per row of a (..., K) problem: maximise sum w*s*log(1 + x/s)
+    over the masked items with sum x = budget. Items get
+    x = s * (w / level - 1) where positive. Rows without budget get an
+    infinite level (every item stays at 0).
+    """
+    w = np.where(mask, w, 0.0)
+    order = np.argsort(-w, axis=-1)
+    ws = np.take_along_axis(w, order, axis=-1)
+    ss = np.take_along_axis(np.where(mask, s, 0.0), order, axis=-1)
+    b = np.maximum(budget, 0.0)[..., None]
+
+    # Level with the top m items active; the true level is the one for the
+    # largest m whose m-th weight is still above it
+    with np.errstate(divide="ignore", invalid="ignore"):
+        levels = np.cumsum(ss * ws, axis=-1) / (b + np.cumsum(ss, axis=-1))
+    n_active = ((ws > levels) & (ws > 0)).sum(axis=-1)
+    level = np.take_along_axis(levels, np.maximum(n_active - 1, 0)[..., None], axis=-1)[..., 0]
+    level = np.where(n_active > 0, level, 0.0)
+    return np.where(budget > _EPS, level, np.inf)
+
+def _allocation(w, s, level):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = s * (w / level - 1.0)
+    return np.where((level > 0) & np.isfinite(level) & (x > 0), x, 0.0)
+
+def _optimal_totals(W, S, E_cap, valid):
+    """
+    Total hours per (student, subject) for subjects sorted by exam date.
+    ``E_cap[:, k]`` is the availability before subject k's exam.
+
+    The first binding prefix of subjects is the one with the highest water
+    level; it is fixed at that level and the rest is solved the same way on
+    what it leaves over. At most K rounds, each vectorised over students.
+    """
+    n, K = W.shape
+    H = np.zeros_like(W)
+    counts = valid.sum(axis=1)
+    start = np.zeros(n, dtype=np.int64)
+    used = np.zeros(n)
+    item = np.arange(K)
+
+    while (start < counts).any():
+        # in_prefix[i, k, j]: item j belongs to prefix k of the remaining items
+        in_prefix = ((item[None, None, :] <= item[None, :, None])
+                     & (item[None, None, :] >= start[:, None, None])
+                     & valid[:, None, :])
+        budget = E_cap - used[:, None]
+        levels = _water_fill(W[:, None, :], S[:, None, :], in_prefix, budget)
+        candidate = (item[None, :] >= start[:, None]) & valid
+        levels = np.where(candidate, levels, -np.inf)
+
+        # Highest level wins; on ties take the longest prefix
+        k_star = K - 1 - np.argmax(levels[:, ::-1], axis=1)
+        level = levels[np.arange(n), k_star]
+        fix = (item[None, :] >= start[:, None]) & (item[None, :] <= k_star[:, None]) & valid
+        x = np.where(fix, _allocation(W, S, level[:, None]), 0.0)
+        H += x
+        used += x.sum(axis=1)
+        start = np.where(start < counts, k_star + 1, start)
+    return H
+
+def _schedule(H, E, cum_avail, avail, valid, min_session):
+    """
+    Lay the totals out over days: each day first takes what later days can
+    no longer fit before each exam, then spreads the rest of every subject
+    evenly over the availability left before its exam. Optional portions
+    shorter than ``min_session`` hours are deferred.
+    """
+    n, K = H.shape
+    horizon = avail.shape[1]
+    rows = np.arange(n)[:, None]
+    remaining = H.copy()
+    cap_at_exam = cum_avail[rows, E]
+    schedule = np.zeros((n, horizon, K))
+
+    for t in range(horizon):
+        a_t = avail[:, t]
+        open_ = valid & (E > t)
+        R = np.where(open_, remaining, 0.0)
+
+        # Amount the subjects due by each exam must get today to stay feasible
+        future = np.maximum(cap_at_exam - cum_avail[:, t + 1][:, None], 0.0)
+        needed = np.maximum.accumulate(np.maximum(np.cumsum(R, axis=1) - future, 0.0), axis=1)
+        needed = np.minimum(needed, a_t[:, None])
+        required = np.clip(np.diff(needed, axis=1, prepend=0.0), 0.0, R)
+
+        # Even pace: share of the capacity left before this subject's exam
+        left = cap_at_exam - cum_avail[:, t][:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pace = np.where(left > _EPS, R * a_t[:, None] / left, 0.0)
+        extra = np.maximum(pace - required, 0.0)
+        room = np.maximum(a_t - required.sum(axis=1), 0.0)[:, None]
+
+        # Fit the optional hours into the room left; sessions that would end
+        # up too short are dropped (and caught up later) and the room they
+        # free goes to the others
+        for _ in range(2):
+            total = extra.sum(axis=1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scaled = extra * np.where(total > room, room / total, 1.0)
+            extra = np.where((required <= 0) & (scaled < min_session), 0.0, extra)
+        total = extra.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            extra = extra * np.where(total > room, room / total, 1.0)
+        today = np.minimum(required + extra, R)
+
+        schedule[:, t, :] = today
+        remaining -= today
+    return schedule
+
+@traced("optimizer.optimize_allocation")
+def optimize_allocation(weights, exam_days, offsets, availability,
+                        saturation_hours=SATURATION_HOURS, min_session_hours=MIN_SESSION_HOURS):
+    """
+    Deadline-aware hours for a whole cohort.
+
+    ``weights`` and ``exam_days`` (days from the start until each subject's
+    exam; study happens on days before it) are flat per-subject arrays split
+    by ``offsets``. ``availability`` is hours per day: a scalar, one row per
+    day shared by everyone, or an (n_students, horizon) array.
+    ``saturation_hours`` may be per subject.
+
+    Returns (total_hours, schedule): total hours per subject, and an
+    (n_subjects, horizon) array of hours per subject per day, both aligned
+    with ``weights``.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    exam_days = np.asarray(exam_days, dtype=np.int64)
+    ids = segment_ids(offsets)
+    n_students = len(offsets) - 1
+    if len(ids) != len(weights) or len(exam_days) != len(weights):
+        raise ValueError("weights and exam_days must both have offsets[-1] entries")
+    if (weights < 0).any():
+        raise ValueError("weights must be non-negative")
+
+    horizon = int(max(exam_days.max(initial=0), 0))
+    availability = np.asarray(availability, dtype=np.float64)
+    if availability.ndim == 0:
+        availability = np.full(horizon, float(availability))
+    if availability.shape[-1] < horizon:
+        raise ValueError(f"availability must cover {horizon} days (up to the last exam)")
+    avail = np.maximum(np.broadcast_to(availability[..., :horizon], (n_students, horizon)), 0.0)
+    saturation = np.broadcast_to(np.asarray(saturation_hours, dtype=np.float64), weights.shape)
+    if (saturation <= 0).any():
+        raise ValueError("saturation_hours must be positive")
+
+    if len(weights) == 0:
+        return np.zeros(0), np.zeros((0, horizon))
+
+    # Dense (student, subject) layout, subjects sorted by exam date
+    order = np.lexsort((exam_days, ids))
+    sorted_ids = ids[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_ids, sorted_ids)
+    width = int(rank.max()) + 1
+    valid = np.zeros((n_students, width), dtype=bool)
+    valid[sorted_ids, rank] = True
+    W = _dense(weights[order], rank, sorted_ids, n_students, width)
+    S = _dense(saturation[order], rank, sorted_ids, n_students, width, fill=1.0)
+    E = _dense(np.clip(exam_days[order], 0, horizon), rank, sorted_ids, n_students, width).astype(np.int64)
+
+    cum_avail = np.concatenate((np.zeros((n_students, 1)), np.cumsum(avail, axis=1)), axis=1)
+    E_cap = cum_avail[np.arange(n_students)[:, None], E]
+
+    H = _optimal_totals(W, S, E_cap, valid)
+    schedule = _schedule(H, E, cum_avail, avail, valid, min_session_hours)
+
+    total_hours = np.empty(len(weights))
+    total_hours[order] = H[sorted_ids, rank]
+    per_item = np.empty((len(weights), horizon))
+    per_item[order] = schedule[sorted_ids, :, rank]
+    return total_hours, per_item
+
+def weekly_availability(weekly_hours, start_date, days):
+    """
+    Expand seven Monday..Sunday hour values into one value per day
+    from ``start_date``
+    """
+    weekly_hours = np.asarray(weekly_hours, dtype=np.float64)
+    if weekly_hours.shape != (7,):
+        raise ValueError("weekly_hours needs one value per weekday (Monday first)")
+    return weekly_hours[(start_date.weekday() + np.arange(days)) % 7]
+
+def optimize_study_plan(subjects, weights, exam_dates, availability, start_date=None,
+                        saturation_hours=SATURATION_HOURS, min_session_hours=MIN_SESSION_HOURS):
+    """
+    Single-student counterpart of optimize_allocation.
+
+    ``exam_dates`` holds one date per subject. ``availability`` is a daily
+    hour budget, seven Monday..Sunday values, or one value per day from
+    ``start_date``. Returns (summary, schedule) DataFrames: total hours per
+    subject, and hours per date and subject (days without study dropped).
+    An exam today still gets today's hours: like the urgency plans, days to
+    an exam are counted with utils.days_until, which never goes below 1.
+    """
+    start_date = date.today() if start_date is None else start_date
+    exam_days = days_until(exam_dates, start_date)
+    horizon = int(max(exam_days.max(initial=0), 0))
+    availability = np.asarray(availability, dtype=np.float64)
+    if availability.shape == (7,) and horizon != 7:
+        availability = weekly_availability(availability, start_date, horizon)
+
+    totals, schedule = optimize_allocation(weights, exam_days, [0, len(weights)], availability,
+                                           saturation_hours, min_session_hours)
+    summary = pd.DataFrame({
+        "Subject": subjects,
+        "Difficulty Weight": weights,
+        "Exam Date": exam_dates,
+        "Total Hours": np.round(totals, 2),
+    })
+    subject_idx, day_idx = np.nonzero(schedule > 0.005)
+    dates = [start_date + timedelta(days=int(d)) for d in range(horizon)]
+    plan = pd.DataFrame({
+        "Date": [dates[d] for d in day_idx],
+        "Subject": np.asarray(subjects, dtype=object)[subject_idx],
+        "Hours": np.round(schedule[subject_idx, day_idx], 2),
+    }).sort_values(["Date", "Subject"], kind="stable", ignore_index=True)
+    return summary, plan
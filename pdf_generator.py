@@ -1,4 +1,4 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Image, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Image, PageBreak, Flowable
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, cm
@@ -14,41 +14,41 @@ from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.lib.colors import HexColor, PCMYKColor, Color
 from io import BytesIO
 import datetime
+import threading
 
-def generate_pdf(df):
-    """
-    Generate a beautifully styled PDF study plan with modern design
-    """
-    buffer = BytesIO()
-    
-    # Create document with custom page size and margins
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=72,
-        leftMargin=72,
-        topMargin=72,
-        bottomMargin=72,
-        title="AI Study Planner - Daily Plan",
-        author="AI Study Planner Pro"
-    )
-    
-    elements = []
-    
-    # -----------------------------
-    # CUSTOM STYLES - MODERN DESIGN
-    # -----------------------------
+import numpy as np
+
+from planner import StudyPlan, plan_digest
+from tracing import traced
+
+
+# Add custom fonts and colors
+PRIMARY_COLOR = HexColor('#667eea')  # Purple
+SECONDARY_COLOR = HexColor('#764ba2')  # Dark Purple
+ACCENT_COLOR = HexColor('#38ef7d')  # Green
+WARNING_COLOR = HexColor('#ff6b6b')  # Red
+TEXT_DARK = HexColor('#2d3748')  # Dark Gray
+TEXT_LIGHT = HexColor('#718096')  # Light Gray
+BACKGROUND_COLOR = HexColor('#f7fafc')  # Off White
+
+# Schedule table cell padding (points), shared by the table style and the
+# precomputed row heights
+HEADER_PADDING = 15
+CELL_PADDING = 12
+CELL_SIDE_PADDING = 6
+
+QUOTES = [
+    "The secret of getting ahead is getting started.",
+    "Success is the sum of small efforts, repeated day in and day out.",
+    "Your only limit is your mind.",
+    "Consistency is more important than perfection.",
+    "Small progress is still progress.",
+]
+
+
+def _build_styles():
     styles = getSampleStyleSheet()
-    
-    # Add custom fonts and colors
-    PRIMARY_COLOR = HexColor('#667eea')  # Purple
-    SECONDARY_COLOR = HexColor('#764ba2')  # Dark Purple
-    ACCENT_COLOR = HexColor('#38ef7d')  # Green
-    WARNING_COLOR = HexColor('#ff6b6b')  # Red
-    TEXT_DARK = HexColor('#2d3748')  # Dark Gray
-    TEXT_LIGHT = HexColor('#718096')  # Light Gray
-    BACKGROUND_COLOR = HexColor('#f7fafc')  # Off White
-    
+
     # Title Style
     styles.add(ParagraphStyle(
         name='CustomTitle',
@@ -60,7 +60,7 @@ def generate_pdf(df):
         fontName='Helvetica-Bold',
         leading=34
     ))
-    
+
     # Subtitle Style
     styles.add(ParagraphStyle(
         name='Subtitle',
@@ -72,7 +72,7 @@ def generate_pdf(df):
         fontName='Helvetica',
         leading=18
     ))
-    
+
     # Section Header Style
     styles.add(ParagraphStyle(
         name='SectionHeader',
@@ -87,7 +87,7 @@ def generate_pdf(df):
         borderColor=PRIMARY_COLOR,
         borderRadius=5
     ))
-    
+
     # Table Header Style
     styles.add(ParagraphStyle(
         name='TableHeader',
@@ -98,7 +98,7 @@ def generate_pdf(df):
         fontName='Helvetica-Bold',
         leading=14
     ))
-    
+
     # Table Cell Style
     styles.add(ParagraphStyle(
         name='TableCell',
@@ -109,7 +109,7 @@ def generate_pdf(df):
         fontName='Helvetica',
         leading=13
     ))
-    
+
     # Info Box Style
     styles.add(ParagraphStyle(
         name='InfoBox',
@@ -124,259 +124,557 @@ def generate_pdf(df):
         spaceBefore=5,
         spaceAfter=5
     ))
-    
-    # -----------------------------
-    # HEADER SECTION
-    # -----------------------------
-    
-    # App Title with Icon
-    title_text = """
-    <para alignment='center'>
-        <font size=28 color='#667eea'><b>📚 AI STUDY PLANNER PRO</b></font>
-    </para>
+
+    return styles
+
+
+class _CellParagraph(Paragraph):
     """
-    elements.append(Paragraph(title_text, styles['CustomTitle']))
-    
-    # Date and Generated Info
-    current_date = datetime.datetime.now().strftime("%B %d, %Y")
-    date_text = f"""
-    <para alignment='center'>
-        <font size=11 color='#718096'>Generated on {current_date} • Powered by Artificial Intelligence</font>
-    </para>
+    A Paragraph that remembers its layout for the last width it was wrapped
+    at. Tables wrap every cell several times (sizing, each page split,
+    drawing), and one instance is shared by every cell with the same text,
+    so each distinct string is laid out once per column width.
+    """
+
+    _wrapped_for = None
+
+    def wrap(self, availWidth, availHeight):
+        if self._wrapped_for != availWidth:
+            self._wrapped = Paragraph.wrap(self, availWidth, availHeight)
+            self._wrapped_for = availWidth
+        return self._wrapped
+
+
+def _format_column(col, values):
     """
-    elements.append(Paragraph(date_text, styles['Subtitle']))
-    
+    Display strings for one schedule column, formatted a column at a time
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        return np.char.add(np.char.mod("%.1f", values), " hrs")
+    if col == "Subject":
+        return np.char.add("📘 ", values.astype(str))
+    if values.dtype.kind != "O":
+        return values.astype(str)
+    # Mixed object columns keep the per-value rules
+    return np.array([
+        f"{v:.1f} hrs" if isinstance(v, float) else str(v)
+        for v in values.tolist()
+    ], dtype=object)
+
+class _ScheduleRows(Flowable):
+    """
+    A long schedule table that is only turned into a reportlab Table one
+    page at a time.
+
+    Splitting a Table re-copies and re-styles every remaining row on each
+    page break, so an n-row schedule over p pages costs O(n * p). Here each
+    page's piece is built from just the rows that fit (found from prefix
+    sums of the row heights), and reportlab's own split produces it, so the
+    pages come out exactly as a single Table's would.
+    """
+
+    hAlign = 'CENTER'
+
+    def __init__(self, rows, col_widths, row_heights, style, start=1, splits=0, bottoms=None):
+        Flowable.__init__(self)
+        self._rows = rows
+        self._col_widths = col_widths
+        self._row_heights = row_heights
+        self._style = style
+        # Body rows start..end-1 are left; row 0 is the repeated header
+        self._start = start
+        # Continuation pieces are restyled once per split; after the second
+        # the commands no longer change
+        self._splits = min(splits, 2)
+        if bottoms is None:
+            bottoms = np.cumsum(row_heights)
+        self._bottoms = bottoms
+        self.width = sum(col_widths)
+
+    def _piece(self, end):
+        """
+        The Table reportlab would have left for rows start..end-1 after
+        splitting the full table just above row ``start``
+        """
+        # Keep the rows before and split them off one at a time, which
+        # applies the continuation styling (repeated header, shifted commands)
+        first = self._start - self._splits
+        table = self._new_table(first, end)
+        for row in range(first, self._start):
+            _, table = table.split(self.width, self._row_heights[0] + self._row_heights[row])
+        return table
+
+    def _new_table(self, first, end):
+        table = Table(self._rows[:1] + self._rows[first:end], colWidths=self._col_widths,
+                      rowHeights=self._row_heights[:1] + self._row_heights[first:end],
+                      repeatRows=1)
+        table.setStyle(self._style)
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        self.height = self._row_heights[0] + self._bottoms[-1] - self._bottoms[self._start - 1]
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        start, n = self._start, len(self._rows)
+        # Rows that fit below the header, plus one so reportlab has a split
+        # point to choose from
+        room = availHeight - self._row_heights[0] + self._bottoms[start - 1]
+        end = min(int(np.searchsorted(self._bottoms, room, side='right')) + 1, n)
+        if end <= start:
+            return []
+        if end >= n:
+            return self._piece(n).split(availWidth, availHeight)
+        parts = self._piece(end).split(availWidth, availHeight)
+        if len(parts) != 2:
+            return []
+        first, rest = parts
+        done = start + len(first._cellvalues) - 1
+        return [first, _ScheduleRows(self._rows, self._col_widths, self._row_heights,
+                                     self._style, done, self._splits + 1, self._bottoms)]
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        table = self._piece(len(self._rows))
+        table.wrapOn(canvas, self.width, self.height)
+        table.drawOn(canvas, x, y, _sW)
+
+
+def _header_line():
     # Decorative Line
     d = Drawing(400, 10)
     d.add(Line(0, 5, 400, 5, strokeColor=PRIMARY_COLOR, strokeWidth=2, strokeDashArray=[5, 5]))
-    elements.append(d)
-    elements.append(Spacer(1, 0.2 * inch))
-    
-    # -----------------------------
-    # STUDY PLAN SUMMARY CARD
-    # -----------------------------
-    
-    elements.append(Paragraph("📋 DAILY STUDY ALLOCATION", styles['SectionHeader']))
-    
-    # Calculate summary statistics
-    total_hours = df['Daily Allocated Hours'].sum() if 'Daily Allocated Hours' in df.columns else 0
-    num_subjects = len(df)
-    avg_hours = total_hours / num_subjects if num_subjects > 0 else 0
-    max_subject = df.loc[df['Daily Allocated Hours'].idxmax(), 'Subject'] if 'Subject' in df.columns and 'Daily Allocated Hours' in df.columns else "N/A"
-    
-    # Create summary box
-    summary_data = [
-        ["📊 Total Daily Hours", f"{total_hours:.1f}h", "🎯 Target: Achieve daily goal"],
-        ["📚 Number of Subjects", str(num_subjects), "⚡ Focus on weak areas"],
-        ["⏰ Average per Subject", f"{avg_hours:.1f}h", f"📌 Priority: {max_subject}"],
-    ]
-    
-    summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 3*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), HexColor('#f8f9fa')),
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
-        ('TEXTCOLOR', (0, 0), (0, -1), PRIMARY_COLOR),
-        ('TEXTCOLOR', (1, 0), (1, -1), SECONDARY_COLOR),
-        ('TEXTCOLOR', (2, 0), (2, -1), TEXT_LIGHT),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-        ('ALIGN', (2, 0), (2, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('LEFTPADDING', (0, 0), (-1, -1), 15),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
-        ('BOX', (0, 0), (-1, -1), 2, PRIMARY_COLOR),
-    ]))
-    
-    elements.append(summary_table)
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    # -----------------------------
-    # MAIN STUDY TABLE - BEAUTIFULLY STYLED
-    # -----------------------------
-    
-    elements.append(Paragraph("🗓️ DETAILED STUDY SCHEDULE", styles['SectionHeader']))
-    
-    # Prepare table data with headers
-    headers = [Paragraph(col, styles['TableHeader']) for col in df.columns]
-    table_data = [headers]
-    
-    # Add rows with alternating colors
-    for idx, row in df.iterrows():
-        row_data = []
-        for col in df.columns:
-            value = row[col]
-            if isinstance(value, float):
-                value = f"{value:.1f} hrs"
-            elif col == "Subject":
-                value = f"📘 {value}"
-            row_data.append(Paragraph(str(value), styles['TableCell']))
-        table_data.append(row_data)
-    
-    # Calculate column widths
-    col_widths = []
-    for i, col in enumerate(df.columns):
-        if col == "Subject":
-            col_widths.append(2.2 * inch)
-        elif "Hours" in col:
-            col_widths.append(1.5 * inch)
-        else:
-            col_widths.append(1.8 * inch)
-    
-    # Create table with beautiful styling
-    table = Table(table_data, colWidths=col_widths, repeatRows=1)
-    
-    # Enhanced table style
-    table_style = TableStyle([
-        # Header row styling
-        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('TOPPADDING', (0, 0), (-1, 0), 15),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
-        
-        # Body styling
-        ('BACKGROUND', (0, 1), (-1, -1), HexColor('#ffffff')),
-        ('TEXTCOLOR', (0, 1), (-1, -1), TEXT_DARK),
-        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 11),
-        ('TOPPADDING', (0, 1), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 12),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
-        ('LINEBELOW', (0, 0), (-1, 0), 2, PRIMARY_COLOR),
-        ('LINEABOVE', (0, 1), (-1, 1), 1, HexColor('#cbd5e0')),
-        
-        # Alternating row colors
-        ('BACKGROUND', (0, 2), (-1, -1), HexColor('#ffffff')),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f8f9fa')]),
-        
-        # Rounded corners effect
-        ('BOX', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
-    ])
-    
-    # Add hour column specific styling
-    for i, col in enumerate(df.columns):
-        if "Hours" in col:
-            table_style.add('TEXTCOLOR', (i, 1), (i, -1), SECONDARY_COLOR)
-            table_style.add('FONTNAME', (i, 1), (i, -1), 'Helvetica-Bold')
-    
-    table.setStyle(table_style)
-    elements.append(table)
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    # -----------------------------
-    # STUDY TIPS SECTION
-    # -----------------------------
-    
-    elements.append(Paragraph("💡 SMART STUDY TIPS", styles['SectionHeader']))
-    
-    # Create tips table with icons
-    tips_data = [
-        ["⏰", "Pomodoro Technique", "25 min study + 5 min break = 1 Pomodoro"],
-        ["🎯", "Active Recall", "Test yourself regularly, don't just read"],
-        ["📊", "Spaced Repetition", "Review material at increasing intervals"],
-        ["💤", "Sleep Well", "7-8 hours sleep improves memory by 40%"],
-        ["💧", "Stay Hydrated", "Water improves cognitive function"],
-        ["🏃", "Take Breaks", "Short walks boost creativity and focus"],
-    ]
-    
-    tips_table = Table(tips_data, colWidths=[0.5*inch, 1.8*inch, 4*inch])
-    tips_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), HexColor('#f8f9fa')),
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
-        ('TEXTCOLOR', (1, 0), (1, -1), PRIMARY_COLOR),
-        ('TEXTCOLOR', (2, 0), (2, -1), TEXT_DARK),
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('ALIGN', (2, 0), (2, -1), 'LEFT'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('LEFTPADDING', (0, 0), (-1, -1), 10),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-    ]))
-    
-    elements.append(tips_table)
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    # -----------------------------
-    # MOTIVATIONAL QUOTE
-    # -----------------------------
-    
-    quotes = [
-        "The secret of getting ahead is getting started.",
-        "Success is the sum of small efforts, repeated day in and day out.",
-        "Your only limit is your mind.",
-        "Consistency is more important than perfection.",
-        "Small progress is still progress.",
-    ]
-    
-    quote_text = f"""
-    <para alignment='center'>
-        <font size=12 color='#667eea'><i>✨ {quotes[hash(str(datetime.datetime.now())) % len(quotes)]} ✨</i></font>
-    </para>
-    """
-    
-    d = Drawing(400, 1)
-    d.add(Line(0, 0, 400, 0, strokeColor=HexColor('#e2e8f0'), strokeWidth=1))
-    elements.append(d)
-    elements.append(Spacer(1, 0.1 * inch))
-    elements.append(Paragraph(quote_text, styles['Normal']))
-    elements.append(Spacer(1, 0.1 * inch))
+    return d
+
+def _divider():
     d = Drawing(400, 1)
     d.add(Line(0, 0, 400, 0, strokeColor=HexColor('#e2e8f0'), strokeWidth=1))
-    elements.append(d)
-    
-    # -----------------------------
-    # FOOTER SECTION
-    # -----------------------------
-    
-    elements.append(Spacer(1, 0.5 * inch))
-    
-    # Footer table with branding
-    footer_data = [
-        ["📚 AI Study Planner Pro", "🤖 Generated by AI", "👨‍💻 Developed by Ishant Kshirsagar"],
-        ["", f"Page 1 of 1 • {current_date}", ""],
-    ]
-    
-    footer_table = Table(footer_data, colWidths=[2.5*inch, 2.5*inch, 2*inch])
-    footer_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-        ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
-        ('TEXTCOLOR', (0, 0), (-1, -1), TEXT_LIGHT),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-        ('TEXTCOLOR', (0, 0), (0, 0), PRIMARY_COLOR),
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ('TOPPADDING', (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
-    
-    elements.append(footer_table)
-    
-    # Copyright
-    copyright_text = """
+    return d
+
+
+class PDFTemplate:
+    """
+    Styles and static content for the study plan PDF, built once and reused.
+
+    Only styles, texts, table data and TableStyles are cached. Paragraphs
+    and Drawings are created fresh for every document: ReportLab marks a
+    flowable as postponed when it pushes it to the next page and refuses to
+    postpone it twice, and that mark would survive into the next build.
+    """
+
+    def __init__(self):
+        styles = self.styles = _build_styles()
+
+        # -----------------------------
+        # HEADER SECTION
+        # -----------------------------
+
+        # App Title with Icon
+        title_text = """
+        <para alignment='center'>
+            <font size=28 color='#667eea'><b>📚 AI STUDY PLANNER PRO</b></font>
+        </para>
+        """
+        self.title_text = title_text
+
+        # -----------------------------
+        # STUDY TIPS SECTION
+        # -----------------------------
+
+        # Create tips table with icons
+        tips_data = [
+            ["⏰", "Pomodoro Technique", "25 min study + 5 min break = 1 Pomodoro"],
+            ["🎯", "Active Recall", "Test yourself regularly, don't just read"],
+            ["📊", "Spaced Repetition", "Review material at increasing intervals"],
+            ["💤", "Sleep Well", "7-8 hours sleep improves memory by 40%"],
+            ["💧", "Stay Hydrated", "Water improves cognitive function"],
+            ["🏃", "Take Breaks", "Short walks boost creativity and focus"],
+        ]
+
+        self.tips_data = tips_data
+        self.tips_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), HexColor('#f8f9fa')),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
+            ('TEXTCOLOR', (1, 0), (1, -1), PRIMARY_COLOR),
+            ('TEXTCOLOR', (2, 0), (2, -1), TEXT_DARK),
+            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('ALIGN', (2, 0), (2, -1), 'LEFT'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+        ])
+
+        # -----------------------------
+        # MOTIVATIONAL QUOTE
+        # -----------------------------
+
+        self.quote_texts = [
+            f"""
+            <para alignment='center'>
+                <font size=12 color='#667eea'><i>✨ {quote} ✨</i></font>
+            </para>
+            """
+            for quote in QUOTES
+        ]
+
+        # Copyright
+        copyright_text = """
 <para alignment='center'>
     <font size=8 color='#a0aec0'>© 2026 Ishant Kshirsagar. All Rights Reserved. AI Study Planner Pro is developed and maintained by Ishant Kshirsagar. Made with ❤️ for students.</font>
 </para>
 """
-    elements.append(Spacer(1, 0.1 * inch))
-    elements.append(Paragraph(copyright_text, styles['Normal']))
-    
+        self.copyright_text = copyright_text
+
+        self._dated_for = None
+        self._date_text = None
+        self._footer = None
+        self._cells = {}
+        self._schedule_styles = {}
+
+    def dated(self, current_date):
+        """
+        Return the subtitle text and footer (data, style) for
+        ``current_date``, rebuilt only when the date changes
+        """
+        if current_date != self._dated_for:
+            # Date and Generated Info
+            date_text = f"""
+            <para alignment='center'>
+                <font size=11 color='#718096'>Generated on {current_date} • Powered by Artificial Intelligence</font>
+            </para>
+            """
+            # Footer table with branding
+            footer_data = [
+                ["📚 AI Study Planner Pro", "🤖 Generated by AI", "👨‍💻 Developed by Ishant Kshirsagar"],
+                ["", f"Page 1 of 1 • {current_date}", ""],
+            ]
+
+            footer_style = TableStyle([
+                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+                ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
+                ('TEXTCOLOR', (0, 0), (-1, -1), TEXT_LIGHT),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+                ('TEXTCOLOR', (0, 0), (0, 0), PRIMARY_COLOR),
+                ('LEFTPADDING', (0, 0), (-1, -1), 0),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+                ('TOPPADDING', (0, 0), (-1, -1), 5),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+            ])
+
+            self._dated_for, self._date_text, self._footer = current_date, date_text, (footer_data, footer_style)
+        return self._date_text, self._footer
+
+    # Tables keep (and partly mutate) layout state while they are split across
+    # pages, so only their data and styles are cached; the Table objects
+    # themselves are cheap to rebuild per document.
+    def tips_table(self):
+        tips_table = Table(self.tips_data, colWidths=[0.5*inch, 1.8*inch, 4*inch])
+        tips_table.setStyle(self.tips_style)
+        return tips_table
+
+    def footer_table(self, current_date):
+        footer_data, footer_style = self.dated(current_date)[1]
+        footer_table = Table(footer_data, colWidths=[2.5*inch, 2.5*inch, 2*inch])
+        footer_table.setStyle(footer_style)
+        return footer_table
+
+    def summary_table(self, df):
+        # Calculate summary statistics
+        if isinstance(df, StudyPlan):
+            hours = df.rounded_hours
+            total_hours = hours.sum()
+            max_subject = df.subjects[int(hours.argmax())] if len(df) else "N/A"
+        else:
+            total_hours = df['Daily Allocated Hours'].sum() if 'Daily Allocated Hours' in df.columns else 0
+            max_subject = df.loc[df['Daily Allocated Hours'].idxmax(), 'Subject'] if 'Subject' in df.columns and 'Daily Allocated Hours' in df.columns else "N/A"
+        num_subjects = len(df)
+        avg_hours = total_hours / num_subjects if num_subjects > 0 else 0
+
+        # Create summary box
+        summary_data = [
+            ["📊 Total Daily Hours", f"{total_hours:.1f}h", "🎯 Target: Achieve daily goal"],
+            ["📚 Number of Subjects", str(num_subjects), "⚡ Focus on weak areas"],
+            ["⏰ Average per Subject", f"{avg_hours:.1f}h", f"📌 Priority: {max_subject}"],
+        ]
+
+        summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 3*inch])
+        summary_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), HexColor('#f8f9fa')),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
+            ('TEXTCOLOR', (0, 0), (0, -1), PRIMARY_COLOR),
+            ('TEXTCOLOR', (1, 0), (1, -1), SECONDARY_COLOR),
+            ('TEXTCOLOR', (2, 0), (2, -1), TEXT_LIGHT),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+            ('ALIGN', (2, 0), (2, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('LEFTPADDING', (0, 0), (-1, -1), 15),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+            ('BOX', (0, 0), (-1, -1), 2, PRIMARY_COLOR),
+        ]))
+        return summary_table
+
+    # Cell paragraphs are shared across rows and documents; the template is
+    # per thread, so no two builds lay them out at the same time
+    MAX_CACHED_CELLS = 4096
+
+    def cell(self, text, style='TableCell'):
+        key = (text, style)
+        paragraph = self._cells.get(key)
+        if paragraph is None:
+            if len(self._cells) >= self.MAX_CACHED_CELLS:
+                self._cells.clear()
+            paragraph = self._cells[key] = _CellParagraph(text, self.styles[style])
+        return paragraph
+
+    def schedule_table(self, df):
+        if isinstance(df, StudyPlan):
+            columns = df.COLUMNS
+            values = (np.array(df.subjects, dtype=object), df.weights, df.rounded_hours)
+        else:
+            columns = tuple(df.columns)
+            values = [df[col].to_numpy() for col in columns]
+
+        # Format whole columns at once, then share one Paragraph per
+        # distinct string (headers, subjects and hour values repeat a lot)
+        table_data = [[self.cell(col, 'TableHeader') for col in columns]]
+        cell_columns = []
+        for col, column in zip(columns, values):
+            texts = _format_column(col, column).tolist()
+            cells = {text: self.cell(text) for text in set(texts)}
+            cell_columns.append([cells[text] for text in texts])
+        table_data.extend(map(list, zip(*cell_columns)))
+
+        # Calculate column widths
+        col_widths = []
+        for i, col in enumerate(columns):
+            if col == "Subject":
+                col_widths.append(2.2 * inch)
+            elif "Hours" in col:
+                col_widths.append(1.5 * inch)
+            else:
+                col_widths.append(1.8 * inch)
+
+        # Row heights come from the shared cell layouts, so page splits
+        # never re-measure rows
+        row_heights = [self._row_height(table_data[0], col_widths, HEADER_PADDING)]
+        row_heights += [self._row_height(row, col_widths, CELL_PADDING) for row in table_data[1:]]
+
+        return _ScheduleRows(table_data, col_widths, row_heights, self._schedule_style(columns))
+
+    @staticmethod
+    def _row_height(cells, col_widths, padding):
+        inner = max(cell.wrap(width - 2 * CELL_SIDE_PADDING, 1e6)[1] for cell, width in zip(cells, col_widths))
+        return inner + 2 * padding
+
+    def _schedule_style(self, columns):
+        table_style = self._schedule_styles.get(columns)
+        if table_style is not None:
+            return table_style
+
+        # Enhanced table style
+        table_style = TableStyle([
+            # Header row styling
+            ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 0), (-1, 0), HEADER_PADDING),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), HEADER_PADDING),
+            ('LEFTPADDING', (0, 0), (-1, -1), CELL_SIDE_PADDING),
+            ('RIGHTPADDING', (0, 0), (-1, -1), CELL_SIDE_PADDING),
+
+            # Body styling
+            ('BACKGROUND', (0, 1), (-1, -1), HexColor('#ffffff')),
+            ('TEXTCOLOR', (0, 1), (-1, -1), TEXT_DARK),
+            ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 11),
+            ('TOPPADDING', (0, 1), (-1, -1), CELL_PADDING),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), CELL_PADDING),
+
+            # Grid styling
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, PRIMARY_COLOR),
+            ('LINEABOVE', (0, 1), (-1, 1), 1, HexColor('#cbd5e0')),
+
+            # Alternating row colors
+            ('BACKGROUND', (0, 2), (-1, -1), HexColor('#ffffff')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f8f9fa')]),
+
+            # Rounded corners effect
+            ('BOX', (0, 0), (-1, -1), 1, HexColor('#e2e8f0')),
+        ])
+
+        # Add hour column specific styling
+        for i, col in enumerate(columns):
+            if "Hours" in col:
+                table_style.add('TEXTCOLOR', (i, 1), (i, -1), SECONDARY_COLOR)
+                table_style.add('FONTNAME', (i, 1), (i, -1), 'Helvetica-Bold')
+
+        self._schedule_styles[columns] = table_style
+        return table_style
+
+    def section_header(self, text):
+        return Paragraph(text, self.styles['SectionHeader'])
+
+    def copyright(self):
+        return Paragraph(self.copyright_text, self.styles['Normal'])
+
+    def flowables(self, df, current_date, quote_index, footer=True):
+        """
+        Full list of flowables for one study plan document (or one section
+        of a combined report); every call returns new flowable objects
+        """
+        date_text, _ = self.dated(current_date)
+        elements = [
+            Paragraph(self.title_text, self.styles['CustomTitle']),
+            Paragraph(date_text, self.styles['Subtitle']),
+            _header_line(),
+            Spacer(1, 0.2 * inch),
+            self.section_header("📋 DAILY STUDY ALLOCATION"),
+            self.summary_table(df),
+            Spacer(1, 0.3 * inch),
+            self.section_header("🗓️ DETAILED STUDY SCHEDULE"),
+            self.schedule_table(df),
+            Spacer(1, 0.3 * inch),
+            self.section_header("💡 SMART STUDY TIPS"),
+            self.tips_table(),
+            Spacer(1, 0.3 * inch),
+            _divider(),
+            Spacer(1, 0.1 * inch),
+            Paragraph(self.quote_texts[quote_index % len(self.quote_texts)], self.styles['Normal']),
+            Spacer(1, 0.1 * inch),
+            _divider(),
+        ]
+        if footer:
+            elements += [
+                Spacer(1, 0.5 * inch),
+                self.footer_table(current_date),
+                Spacer(1, 0.1 * inch),
+                self.copyright(),
+            ]
+        return elements
+
+
+# Flowables keep layout state while a document is being built, so each thread
+# gets its own template rather than sharing one across concurrent builds.
+_local = threading.local()
+
+def get_template():
+    """
+    Return this thread's PDFTemplate, building it on first use
+    """
+    template = getattr(_local, "template", None)
+    if template is None:
+        template = _local.template = PDFTemplate()
+    return template
+
+def _new_document(sink, title="AI Study Planner - Daily Plan", invariant=None):
+    # Create document with custom page size and margins
+    return SimpleDocTemplate(
+        sink,
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=72,
+        title=title,
+        author="AI Study Planner Pro",
+        invariant=invariant
+    )
+
+
+class _FlowableStream(list):
+    """
+    A list that ReportLab can consume like any flowables list, but which only
+    pulls ``lookahead`` items at a time from ``source``
+    """
+
+    def __init__(self, source, lookahead=64):
+        super().__init__()
+        self._source = iter(source)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        n = super().__len__()
+        if self._source is not None and n < self._lookahead:
+            for f in self._source:
+                self.append(f)
+                n += 1
+                if n >= self._lookahead:
+                    break
+            else:
+                self._source = None
+        return n
+
+@traced("pdf_generator.generate_pdf")
+def generate_pdf(df, deterministic=False, today=None):
+    """
+    Generate a beautifully styled PDF study plan with modern design.
+    ``df`` is a StudyPlan or a plan DataFrame.
+
+    With ``deterministic`` the output depends only on the plan and the date
+    (``today``, default the current date): the quote is picked from the
+    plan's content hash and the PDF carries no creation time or random ID,
+    so the same plan renders to the same bytes all day.
+    """
+    buffer = BytesIO()
+    if deterministic:
+        today = datetime.date.today() if today is None else today
+        doc = _new_document(buffer, invariant=1)
+        quote_index = int(plan_digest(df)[:8], 16)
+    else:
+        today = datetime.datetime.now() if today is None else today
+        doc = _new_document(buffer)
+        quote_index = hash(str(datetime.datetime.now()))
+
+    current_date = today.strftime("%B %d, %Y")
+    elements = get_template().flowables(df, current_date, quote_index)
+
     # Build PDF
     doc.build(elements)
-    
+
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
+
+def _class_report_flowables(students, template, current_date):
+    for i, (name, df) in enumerate(students):
+        if i:
+            yield PageBreak()
+        yield template.section_header(f"👤 {name}")
+        yield from template.flowables(df, current_date, i, footer=False)
+    yield Spacer(1, 0.5 * inch)
+    yield template.copyright()
+
+@traced("pdf_generator.generate_class_report")
+def generate_class_report(students, sink):
+    """
+    Write one combined PDF for a whole class, one page-separated section per
+    student, to ``sink`` (a file path or writable binary file object).
+
+    ``students`` is an iterable of (name, StudyPlan or DataFrame) pairs and is
+    consumed lazily while the document is laid out, so it can be a generator
+    and only a few sections' flowables are alive at any time. Memory still
+    grows with the page count: ReportLab keeps every finished page's content
+    stream, uncompressed, until the file is saved (about 23 KB per
+    five-subject student, so ~37 MB for 1600 students). Split very large
+    classes into several reports.
+    """
+    doc = _new_document(sink, title="AI Study Planner - Class Report")
+    current_date = datetime.datetime.now().strftime("%B %d, %Y")
+    template = get_template()
+    doc.build(_FlowableStream(_class_report_flowables(students, template, current_date)))
+    return sink
@@ -0,0 +1,110 @@
+"""
+Background PDF rendering.
+
+Plans are rendered on a shared thread pool as soon as they exist, and the
+resulting bytes are kept in a small content-addressed cache keyed by a hash
+of the plan. Callers hold on to the key and fetch the bytes when
+they are actually needed (e.g. when a download is clicked).
+
+PDFs are rendered in deterministic mode, so the bytes depend only on the
+plan and the date. They (and plan CSVs) are also kept in the on-disk
+artifact cache, where repeat downloads and identical plans from other
+sessions or processes are served without rendering again.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from importlib.metadata import version
+
+from artifact_cache import get_cache
+from planner import StudyPlan, plan_digest
+
+PDF_WORKERS = int(os.environ.get("STUDY_PLANNER_PDF_WORKERS", "2"))
+CACHE_ENTRIES = 256
+# Bump when the PDF layout or CSV format changes, to retire cached files
+ARTIFACT_VERSION = 1
+
+_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="pdf-render")
+_lock = threading.Lock()
+_jobs = OrderedDict()  # key -> Future[bytes], least recently used first
+
+def _artifact_key(digest, kind, day=None):
+    # PDFs are stamped with the date, and their bytes depend on reportlab
+    if kind == "pdf":
+        return f"pdf-{ARTIFACT_VERSION}-{version('reportlab')}-{digest}-{day.isoformat()}"
+    return f"{kind}-{ARTIFACT_VERSION}-{digest}"
+
+def cached_pdf(df, day=None):
+    """
+    PDF bytes for ``df`` from the disk cache, or None if not rendered yet
+    """
+    day = date.today() if day is None else day
+    return get_cache().get(_artifact_key(plan_digest(df), "pdf", day), ".pdf")
+
+def render_pdf(df, day=None, digest=None):
+    """
+    PDF bytes for ``df`` dated ``day`` (default today), rendered in this
+    thread on a disk cache miss
+    """
+    day = date.today() if day is None else day
+    digest = plan_digest(df) if digest is None else digest
+
+    def render():
+        from pdf_generator import generate_pdf
+
+        return generate_pdf(df, deterministic=True, today=day).getvalue()
+
+    return get_cache().get_or_create(_artifact_key(digest, "pdf", day), render, ".pdf")
+
+def get_csv(df):
+    """
+    CSV bytes for a StudyPlan or plan DataFrame, through the disk cache
+    """
+    def render():
+        csv = df.to_csv() if isinstance(df, StudyPlan) else df.to_csv(index=False)
+        return csv.encode("utf-8")
+
+    return get_cache().get_or_create(_artifact_key(plan_digest(df), "csv"), render, ".csv")
+
+def submit_pdf(df):
+    """
+    Start rendering ``df`` in the background unless it is already cached or
+    in flight. Returns the cache key to pass to get_pdf().
+    """
+    # The PDF is stamped with today's date, so the date is part of the key
+    digest, day = plan_digest(df), date.today()
+    key = f"{digest}-{day.isoformat()}"
+    with _lock:
+        if key in _jobs:
+            _jobs.move_to_end(key)
+            return key
+        # StudyPlans aren't mutated after construction; DataFrames might be
+        _jobs[key] = _executor.submit(render_pdf, df if isinstance(df, StudyPlan) else df.copy(),
+                                      day, digest)
+        while len(_jobs) > CACHE_ENTRIES:
+            _jobs.popitem(last=False)
+    return key
+
+def get_pdf(key, df=None, timeout=None):
+    """
+    PDF bytes for ``key``, waiting for the render if it is still running.
+    If the entry was evicted or failed, ``df`` (when given) is re-rendered.
+    """
+    with _lock:
+        future = _jobs.get(key)
+        if future is not None:
+            _jobs.move_to_end(key)
+    if future is None:
+        if df is None:
+            raise KeyError(key)
+        key = submit_pdf(df)
+        return get_pdf(key, timeout=timeout)
+    try:
+        return future.result(timeout)
+    except Exception:
+        with _lock:
+            if _jobs.get(key) is future:
+                del _jobs[key]
+        raise
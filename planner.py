@@ -1,14 +1,200 @@
+import csv
+import hashlib
+from io import StringIO
+
 import numpy as np
 import pandas as pd
 
+from tracing import traced
+from utils import days_until
+
+DIFFICULTY_MAP = {
+    "Weak": 3,
+    "Medium": 2,
+    "Strong": 1
+}
+
+class StudyPlan:
+    """
+    One student's daily plan as parallel arrays.
+
+    ``hours`` keeps the unrounded allocation; the DataFrame (and anything
+    shown to the user) uses hours rounded to 2 decimals. The DataFrame is
+    only built when something asks for it, so a plan that is just scored,
+    charted or rendered to PDF never pays for pandas.
+    """
+
+    __slots__ = ("subjects", "weights", "hours", "_df")
+
+    COLUMNS = ("Subject", "Difficulty Weight", "Daily Allocated Hours")
+
+    def __init__(self, subjects, weights, hours):
+        self.subjects = tuple(subjects)
+        self.weights = np.asarray(weights)
+        self.hours = np.asarray(hours, dtype=np.float64)
+        self._df = None
+
+    def __len__(self):
+        return len(self.subjects)
+
+    def __getstate__(self):
+        return self.subjects, self.weights, self.hours
+
+    def __setstate__(self, state):
+        self.subjects, self.weights, self.hours = state
+        self._df = None
+
+    @property
+    def rounded_hours(self):
+        return np.round(self.hours, 2)
+
+    def rows(self):
+        """
+        (subject, weight, rounded hours) tuples in display order
+        """
+        return zip(self.subjects, self.weights.tolist(), self.rounded_hours.tolist())
+
+    def to_dataframe(self):
+        if self._df is None:
+            self._df = pd.DataFrame({
+                "Subject": self.subjects,
+                "Difficulty Weight": self.weights,
+                "Daily Allocated Hours": self.rounded_hours
+            })
+        return self._df
+
+    def to_csv(self):
+        """
+        Same text as ``to_dataframe().to_csv(index=False)``
+        """
+        buffer = StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(self.COLUMNS)
+        writer.writerows(self.rows())
+        return buffer.getvalue()
+
+def plan_digest(df):
+    """
+    Content hash of a StudyPlan or plan DataFrame (columns, dtypes and values)
+    """
+    h = hashlib.sha256()
+    if isinstance(df, StudyPlan):
+        h.update("\x1f".join(df.subjects).encode("utf-8"))
+        h.update(df.weights.tobytes())
+        h.update(df.rounded_hours.tobytes())
+        return h.hexdigest()
+    h.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update("\x1f".join(map(str, df.dtypes)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+@traced("planner.build_study_plan")
+def build_study_plan(subjects, weights, total_hours):
+    weights = np.asarray(weights)
+    total_weight = weights.sum()
+    return StudyPlan(subjects, weights, weights / total_weight * total_hours)
+
+@traced("planner.generate_study_plan")
 def generate_study_plan(subjects, weights, total_hours):
-    total_weight = sum(weights)
-    allocated_hours = [(w / total_weight) * total_hours for w in weights]
+    plan = build_study_plan(subjects, weights, total_hours)
+    return plan.to_dataframe(), plan.hours.tolist()
+
+def segment_ids(offsets):
+    """
+    Map CSR-style offsets (length N + 1) to the owning segment of every item
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or (counts < 0).any():
+        raise ValueError("offsets must be a non-decreasing 1-D array starting at 0")
+    return np.repeat(np.arange(len(counts)), counts)
+
+@traced("planner.generate_study_plans_batch")
+def generate_study_plans_batch(weights, offsets, total_hours, subjects=None):
+    """
+    Vectorized generate_study_plan for a whole cohort.
+
+    Student i owns ``weights[offsets[i]:offsets[i + 1]]``; ``total_hours`` is a
+    scalar or one value per student. Returns a long-format DataFrame (one row
+    per student/subject) and the unrounded allocated hours as a flat array.
+    """
+    weights = np.asarray(weights)
+    ids = segment_ids(offsets)
+    if len(ids) != len(weights):
+        raise ValueError("offsets[-1] must equal the number of weights")
+
+    n_students = len(offsets) - 1
+    total_hours = np.broadcast_to(np.asarray(total_hours, dtype=np.float64), (n_students,))
+
+    total_weight = np.bincount(ids, weights=weights.astype(np.float64), minlength=n_students)
+    if (total_weight[ids] <= 0).any():
+        raise ValueError("every student needs a positive total weight")
+
+    allocated_hours = weights / total_weight[ids] * total_hours[ids]
+
+    if subjects is None:
+        subjects = np.arange(len(weights)) - np.asarray(offsets, dtype=np.int64)[ids]
 
     df = pd.DataFrame({
+        "Student": ids,
         "Subject": subjects,
         "Difficulty Weight": weights,
         "Daily Allocated Hours": np.round(allocated_hours, 2)
     })
 
     return df, allocated_hours
+
+def urgency_matrix(weights, exam_days, horizon=None):
+    """
+    Day x subject matrix of urgency weights ``weight / days left``.
+
+    Row t holds the weights for t days from now; a subject drops to 0 from
+    its exam day on. ``horizon`` defaults to the last exam.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    exam_days = np.asarray(exam_days, dtype=np.int64)
+    horizon = int(exam_days.max(initial=0)) if horizon is None else horizon
+    days_left = exam_days[None, :] - np.arange(horizon)[:, None]
+    with np.errstate(divide="ignore"):
+        return np.where(days_left > 0, weights / days_left, 0.0)
+
+@traced("planner.generate_urgency_plans_batch")
+def generate_urgency_plans_batch(weights, exam_days, offsets, total_hours, horizon=None):
+    """
+    Urgency-weighted daily hours for a whole cohort and every day up to the
+    last exam, laid out like generate_study_plans_batch.
+
+    ``exam_days`` counts days from today to each subject's exam. Returns a
+    (horizon, n_subjects) array: row t is the plan for t days from now, so
+    as deadlines pass each day's allocation is a row lookup rather than a
+    re-plan. Days on which all of a student's exams are over get 0 hours.
+    """
+    ids = segment_ids(offsets)
+    if len(ids) != len(weights) or len(exam_days) != len(weights):
+        raise ValueError("weights and exam_days must both have offsets[-1] entries")
+    n_students = len(offsets) - 1
+    total_hours = np.broadcast_to(np.asarray(total_hours, dtype=np.float64), (n_students,))
+
+    urgency = urgency_matrix(weights, exam_days, horizon)
+
+    # Per-student row totals from a running sum across the subject axis
+    csum = np.concatenate((np.zeros((len(urgency), 1)), np.cumsum(urgency, axis=1)), axis=1)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    student_total = csum[:, offsets[1:]] - csum[:, offsets[:-1]]
+
+    denom = student_total[:, ids]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denom > 0, urgency / denom * total_hours[ids], 0.0)
+
+def generate_multi_exam_plan(subjects, weights, exam_dates, total_hours, today=None):
+    """
+    build_study_plan with a separate exam date per subject: today's
+    allocation is weighted by ``weight / days left``. With a single shared
+    date this is the same as the proportional plan.
+
+    Returns (plan, daily_hours), where ``daily_hours`` is the
+    (days until the last exam, subjects) matrix of future daily plans.
+    """
+    exam_days = days_until(exam_dates, today)
+    daily_hours = generate_urgency_plans_batch(weights, exam_days, [0, len(weights)], total_hours)
+    return StudyPlan(subjects, weights, daily_hours[0]), daily_hours
@@ -0,0 +1,222 @@
+"""
+Persistent storage for the daily study progress tracker.
+
+Entries live in a local SQLite database in WAL mode. Every insert also
+updates a per-user aggregates row (total, count, streak) in the same
+transaction, so dashboard numbers are a single primary-key lookup no matter
+how long the history is.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+DB_PATH = os.environ.get(
+    "STUDY_PLANNER_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "progress.db"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    logged_on TEXT NOT NULL,
+    hours REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS progress_user ON progress (user_id, id);
+CREATE TABLE IF NOT EXISTS outcomes (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    recorded_on TEXT NOT NULL,
+    hours REAL NOT NULL,
+    days REAL NOT NULL,
+    difficulty REAL NOT NULL,
+    score REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS progress_stats (
+    user_id TEXT PRIMARY KEY,
+    total REAL NOT NULL,
+    count INTEGER NOT NULL,
+    streak INTEGER NOT NULL,
+    last_active TEXT
+);
+"""
+
+EMPTY_STATS = {"total": 0.0, "count": 0, "mean": 0.0, "streak": 0, "last_active": None}
+
+
+class ProgressStore:
+    """
+    One shared SQLite connection per process with batched, buffered writes.
+
+    ``add`` only buffers; the buffer is written in a single transaction once
+    ``batch_size`` entries are pending, on ``flush()``, before any read, and
+    at interpreter exit.
+    """
+
+    def __init__(self, path=DB_PATH, batch_size=64):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._pending = []
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        atexit.register(self.close)
+
+    def add(self, user_id, hours, logged_on=None):
+        logged_on = date.today() if logged_on is None else logged_on
+        with self._lock:
+            self._pending.append((user_id, logged_on, float(hours)))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def add_many(self, entries):
+        """
+        Buffer (user_id, hours, logged_on) tuples and write them in one batch
+        """
+        with self._lock:
+            self._pending.extend((user_id, logged_on, float(hours)) for user_id, hours, logged_on in entries)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            conn = self._conn
+            # Take the buffer only once the write lock is held, so a database
+            # locked by another process leaves the entries pending
+            conn.execute("BEGIN IMMEDIATE")
+            pending, self._pending = self._pending, []
+            try:
+                stats = {}
+                for user_id, logged_on, hours in pending:
+                    if user_id not in stats:
+                        stats[user_id] = self._read_stats(user_id)
+                    _apply_entry(stats[user_id], logged_on, hours)
+                conn.executemany(
+                    "INSERT INTO progress (user_id, logged_on, hours) VALUES (?, ?, ?)",
+                    [(u, d.isoformat(), h) for u, d, h in pending],
+                )
+                conn.executemany(
+                    "INSERT INTO progress_stats (user_id, total, count, streak, last_active) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (user_id) DO UPDATE SET "
+                    "total = excluded.total, count = excluded.count, "
+                    "streak = excluded.streak, last_active = excluded.last_active",
+                    [(u, s["total"], s["count"], s["streak"], s["last_active"]) for u, s in stats.items()],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._pending[:0] = pending
+                raise
+
+    def _read_stats(self, user_id):
+        row = self._conn.execute(
+            "SELECT total, count, streak, last_active FROM progress_stats WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        if row is None:
+            return {"total": 0.0, "count": 0, "streak": 0, "last_active": None}
+        return {"total": row[0], "count": row[1], "streak": row[2], "last_active": row[3]}
+
+    def stats(self, user_id, today=None):
+        """
+        Running aggregates for ``user_id``: total, count, mean, streak and
+        last_active. The streak counts consecutive days with study time and
+        is 0 once a whole day has been missed.
+        """
+        with self._lock:
+            self.flush()
+            s = self._read_stats(user_id)
+        if s["count"] == 0:
+            return dict(EMPTY_STATS)
+        today = date.today() if today is None else today
+        streak = s["streak"]
+        if s["last_active"] is None or date.fromisoformat(s["last_active"]) < today - timedelta(days=1):
+            streak = 0
+        return {**s, "mean": s["total"] / s["count"], "streak": streak}
+
+    def history(self, user_id):
+        """
+        All logged hours for ``user_id`` in insertion order, as
+        (logged_on datetime64[D] array, hours float array)
+        """
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT logged_on, hours FROM progress WHERE user_id = ? ORDER BY id",
+                (user_id,),
+            ).fetchall()
+        if not rows:
+            return np.zeros(0, dtype="datetime64[D]"), np.zeros(0)
+        days, hours = zip(*rows)
+        return np.array(days, dtype="datetime64[D]"), np.array(hours, dtype=np.float64)
+
+    def add_outcome(self, user_id, hours, days, difficulty, score, recorded_on=None):
+        """
+        Record an observed result (e.g. a mock test score) together with the
+        model features at the time: daily hours, days to the exam and
+        average difficulty
+        """
+        recorded_on = date.today() if recorded_on is None else recorded_on
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO outcomes (user_id, recorded_on, hours, days, difficulty, score) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, recorded_on.isoformat(), float(hours), float(days), float(difficulty), float(score)),
+            )
+
+    def iter_outcomes(self, after_id=0, chunk_size=100000):
+        """
+        Yield (last_id, X, y) chunks of outcomes with id > ``after_id`` across
+        all users, where X holds (hours, days, difficulty) rows and y the scores
+        """
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, hours, days, difficulty, score FROM outcomes "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, chunk_size),
+                ).fetchall()
+            if not rows:
+                return
+            data = np.array(rows, dtype=np.float64)
+            after_id = int(data[-1, 0])
+            yield after_id, data[:, 1:4], data[:, 4]
+            if len(rows) < chunk_size:
+                return
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+
+def _apply_entry(stats, logged_on, hours):
+    """
+    Fold one entry into a user's running aggregates
+    """
+    stats["total"] += hours
+    stats["count"] += 1
+    if hours <= 0:
+        return
+    last = stats["last_active"]
+    day = logged_on.isoformat()
+    if last is None or logged_on > date.fromisoformat(last) + timedelta(days=1):
+        stats["streak"] = 1
+    elif logged_on == date.fromisoformat(last) + timedelta(days=1):
+        stats["streak"] += 1
+    else:
+        # Same day, or a backfilled earlier day: the streak is unchanged
+        return
+    stats["last_active"] = day
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from allocation import apportion
+
+
+def _ideal_quotas(weights, budget, lo, hi):
+    """
+    clip(lam * w, lo, hi) summing to ``budget``, by bisection on lam
+    """
+    positive = weights > 0
+    hi = np.where(positive, hi, lo)
+    if budget <= lo.sum():
+        return lo
+    a, b = 0.0, float(np.max(hi / np.where(positive, weights, 1.0)))
+    for _ in range(200):
+        lam = (a + b) / 2
+        if np.clip(lam * weights, lo, hi).sum() < budget:
+            a = lam
+        else:
+            b = lam
+    return np.clip(b * weights, lo, hi)
+
+def _random_batch(rng, integer_weights):
+    sizes = rng.integers(1, 7, size=rng.integers(1, 12))
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    n = offsets[-1]
+    if integer_weights:
+        weights = rng.integers(0, 10, size=n).astype(float)
+    else:
+        weights = rng.random(n) * rng.choice([0.01, 1.0, 100.0])
+        weights[rng.random(n) < 0.1] = 0.0
+    lo = np.where(rng.random(n) < 0.3, rng.integers(0, 5, size=n), 0)
+    hi = np.where(rng.random(n) < 0.5, lo + rng.integers(0, 40, size=n), 1000)
+    budgets = []
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        w, l, h = weights[start:end], lo[start:end], hi[start:end]
+        h = np.where(w > 0, h, l)
+        budgets.append(rng.integers(l.sum(), min(h.sum(), l.sum() + 200) + 1))
+    return weights, offsets, np.array(budgets), lo, hi
+
+@pytest.mark.parametrize("seed", range(200))
+@pytest.mark.parametrize("integer_weights", [False, True])
+def test_random_batches(seed, integer_weights):
+    rng = np.random.default_rng(seed)
+    weights, offsets, budgets, lo, hi = _random_batch(rng, integer_weights)
+    units = apportion(weights, offsets, budgets, lo, hi)
+
+    for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        w, u, l, h = weights[start:end], units[start:end], lo[start:end], hi[start:end]
+        assert u.sum() == budgets[i]
+        assert (u >= l).all() and (u <= h).all()
+        assert (u[w == 0] == l[w == 0]).all()
+        # Each student gets the same minutes in a batch as on their own
+        solo = apportion(w, [0, len(w)], budgets[i], l, h)
+        np.testing.assert_array_equal(u, solo)
+        # and never strays a whole unit from the ideal real-valued split
+        ideal = _ideal_quotas(w, budgets[i], l.astype(float), h.astype(float))
+        assert (np.abs(u - ideal) < 1 + 1e-6).all()
+
+def test_float_weights_multi_student():
+    units = apportion([0.2, 0.5, 0.5, 0.9, 0.1], [0, 2, 5], [22, 46], None, [4, 18, 7, 25, 19])
+    np.testing.assert_array_equal(units, [4, 18, 7, 25, 14])
+
+def test_single_subject_student_gets_whole_budget():
+    units = apportion([0.05, 0.64, 0.61, 0.41], [0, 2, 3, 4], [48, 59, 58])
+    np.testing.assert_array_equal(units[2:], [59, 58])
+    assert units[:2].sum() == 48
+
+def test_remainder_skips_capped_items():
+    units = apportion([1.0, 1.0, 1.0, 0.0], [0, 4], [10], None, [3, 10, 10, 10])
+    assert units.sum() == 10
+    assert units[0] <= 3 and units[3] == 0
+
+def test_infeasible_budget():
+    with pytest.raises(ValueError):
+        apportion([1.0, 1.0], [0, 2], [10], None, [3, 3])
@@ -0,0 +1,10 @@
+import numpy as np
+
+import analytics
+
+
+def test_active_days_count_calendar_days():
+    days = np.array(["2026-01-01", "2026-01-01", "2026-01-03", "2026-01-04"], dtype="datetime64[D]")
+    summary = analytics.summarize(days, [3.0, 3.0, 0.0, 2.0], 4)
+    assert summary["active_days"] == 2
+    np.testing.assert_array_equal(summary["daily"], [6.0, 0.0, 0.0, 2.0])
@@ -0,0 +1,45 @@
+import json
+import socket
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from api import make_server
+
+
+@pytest.fixture
+def server():
+    service = SimpleNamespace(plan=lambda payload: {"echo": payload}, predict=None, pdf=None,
+                              schedule=None, health=lambda: {"status": "ok"})
+    server = make_server(port=0, service=service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _post(server, content_length, body=b""):
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(b"POST /plan HTTP/1.1\r\nHost: x\r\nContent-Length: "
+                     + content_length.encode() + b"\r\n\r\n" + body)
+        response = b""
+        while chunk := sock.recv(65536):
+            response += chunk
+            head, _, rest = response.partition(b"\r\n\r\n")
+            if b"Content-Length: " in head:
+                size = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                if len(rest) >= size:
+                    break
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+@pytest.mark.parametrize("content_length", ["-1", "abc", "1.5", ""])
+def test_bad_content_length_is_rejected(server, content_length):
+    status, body = _post(server, content_length)
+    assert status == 400
+    assert "Content-Length" in body["error"]
+
+def test_valid_content_length(server):
+    status, body = _post(server, "9", b'{"a": 1}\n')
+    assert (status, body) == (200, {"echo": {"a": 1}})
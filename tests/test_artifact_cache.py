@@ -0,0 +1,29 @@
+import os
+
+from artifact_cache import ArtifactCache
+
+
+def test_unusable_directory_falls_back_to_rendering(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    cache = ArtifactCache(str(blocker / "cache"), max_bytes=2**20)
+
+    assert cache.get("k") is None
+    cache.put("k", b"data")
+    assert cache.get_or_create("k", lambda: b"rendered") == b"rendered"
+
+def test_overwrite_does_not_inflate_size(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=2**20)
+    cache.put("a", b"x" * 100)
+    for _ in range(10):
+        cache.put("b", b"y" * 100)
+    assert cache._size == 200 == sum(f.stat().st_size for f in tmp_path.iterdir())
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=250)
+    cache.put("a", b"x" * 100)
+    cache.put("b", b"x" * 100)
+    os.utime(cache.path("a"), (0, 0))
+    cache.put("c", b"x" * 100)
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
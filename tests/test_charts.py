@@ -0,0 +1,16 @@
+import matplotlib.pyplot as plt
+import pytest
+
+import charts
+
+
+def test_failed_render_closes_its_figure():
+    plt.close("all")
+    with pytest.raises(ValueError):
+        charts.render_time_distribution(("a", "b"), (0.0, 0.0))
+    assert plt.get_fignums() == []
+
+def test_render_closes_its_figure():
+    plt.close("all")
+    assert charts.render_subject_priority(("a", "b"), (3.0, 1.0)).startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
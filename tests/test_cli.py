@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cli import PARSE_ERROR, _map_bounded, parse_student, read_students, render_student
+
+
+def _record(daily_hours):
+    return {"subjects": "Math;Physics", "difficulties": "Weak;Strong", "daily_hours": daily_hours}
+
+@pytest.mark.parametrize("daily_hours", [-3, 0, 24.5, "nan"])
+def test_daily_hours_out_of_range(daily_hours):
+    with pytest.raises(ValueError):
+        parse_student(_record(daily_hours), require_exam_date=False)
+
+def test_valid_record():
+    subjects, weights, daily_hours, exam_date = parse_student(_record(24), require_exam_date=False)
+    assert subjects == ["Math", "Physics"]
+    assert weights == [3, 1]
+    assert daily_hours == 24.0
+    assert exam_date is None
+
+def test_malformed_jsonl_line_is_one_failed_record(tmp_path):
+    path = tmp_path / "students.jsonl"
+    path.write_text('{"name": "a"}\n{oops\n[1]\n', encoding="utf-8")
+    records = list(read_students(str(path)))
+    assert len(records) == 3
+    for record in records[1:]:
+        row, pdf_bytes = render_student((0, record, None))
+        assert row["error"].startswith("ValueError: line") and pdf_bytes is None
+
+def test_jobs_are_read_in_bounded_windows():
+    consumed = []
+
+    def jobs():
+        for i in range(100):
+            consumed.append(i)
+            yield i, {PARSE_ERROR: "bad"}, None
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = _map_bounded(executor, jobs(), chunksize=4, window=3)
+        next(results)
+        assert len(consumed) <= 4 * 3 + 1
+        assert len(list(results)) == 99
@@ -0,0 +1,7 @@
+from benchmarks.importtime import LAZY_MODULES, collect
+
+
+def test_heavy_dependencies_stay_lazy():
+    loaded = {module.split(".")[0] for module, *_ in collect()}
+    assert loaded, "no import timings were collected"
+    assert sorted(loaded.intersection(LAZY_MODULES)) == []
@@ -0,0 +1,35 @@
+import os
+import threading
+
+import model_registry
+from ml_model import IncrementalLinearModel
+from progress_store import ProgressStore
+
+
+def test_concurrent_refreshes_fold_each_outcome_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_DIR", str(tmp_path))
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    for _ in range(5000):
+        store.add_outcome("u", 4, 30, 2, 70.0)
+    store.flush()
+
+    model = IncrementalLinearModel()
+    threads = [threading.Thread(target=model_registry.refresh_incremental_model, args=(model, store))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    store.close()
+
+    assert model.n_samples == 5000
+
+def test_first_load_saves_the_config_keyed_artifact(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_DIR", str(tmp_path))
+    model = model_registry.load_incremental_model()
+    path = model_registry.incremental_path()
+    assert os.path.exists(path)
+
+    monkeypatch.setattr(model_registry, "train_incremental_model", None)
+    reloaded = model_registry.load_incremental_model()
+    assert reloaded.n_samples == model.n_samples
@@ -0,0 +1,12 @@
+from datetime import date, timedelta
+
+from optimizer import optimize_study_plan
+
+
+def test_exam_today_still_gets_hours():
+    today = date(2026, 3, 2)
+    summary, plan = optimize_study_plan(["A", "B"], [3, 1], [today, today + timedelta(days=3)], 4,
+                                        start_date=today)
+    hours = dict(zip(summary["Subject"], summary["Total Hours"]))
+    assert hours["A"] > 0
+    assert set(plan.loc[plan["Date"] == today, "Subject"]) >= {"A"}
@@ -0,0 +1,15 @@
+import tracing
+from planner import build_study_plan, plan_digest
+
+
+def test_build_study_plan_is_traced():
+    tracing.reset()
+    tracing.enable()
+    try:
+        plan = build_study_plan(["Math", "Physics"], [3, 1], 4)
+        plan_digest(plan)
+        stages = tracing.summary()
+    finally:
+        tracing.disable()
+        tracing.reset()
+    assert stages["planner.build_study_plan"]["count"] == 1
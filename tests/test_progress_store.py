@@ -0,0 +1,24 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from progress_store import ProgressStore
+
+
+def test_flush_keeps_entries_while_database_is_locked(tmp_path):
+    path = str(tmp_path / "progress.db")
+    store = ProgressStore(path)
+    other = sqlite3.connect(path, isolation_level=None, timeout=0)
+    store._conn.execute("PRAGMA busy_timeout = 0")
+
+    other.execute("BEGIN IMMEDIATE")
+    store.add("u", 2.0, date(2026, 1, 1))
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert len(store._pending) == 1
+
+    other.execute("ROLLBACK")
+    other.close()
+    assert store.stats("u", today=date(2026, 1, 1))["count"] == 1
+    store.close()
@@ -0,0 +1,133 @@
+"""
+Day-by-day, slot-by-slot study timetable from today until the exam.
+
+The timetable is columnar: three parallel NumPy arrays (day, slot, subject id)
+with one entry per study slot, so long horizons for whole cohorts stay small.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from allocation import POMODORO_MINUTES, apportion
+from utils import calculate_days_remaining
+
+# Gaps (in days) between successive full-revision days, so reviews land on
+# days 1, 3, 7, 15, 31, ... of the plan
+REVIEW_INTERVALS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class Timetable:
+    """
+    A study timetable stored as parallel arrays.
+
+    ``day[i]`` (days since ``start_date``), ``slot[i]`` (position within that
+    day) and ``subject[i]`` (index into ``subjects``) describe the i-th slot,
+    each ``slot_minutes`` long. ``day_slots`` and ``revision`` hold one value
+    per day.
+    """
+
+    __slots__ = ("start_date", "subjects", "slot_minutes",
+                 "day", "slot", "subject", "day_slots", "revision")
+
+    def __init__(self, start_date, subjects, slot_minutes, day, slot, subject, day_slots, revision):
+        self.start_date = start_date
+        self.subjects = tuple(subjects)
+        self.slot_minutes = slot_minutes
+        self.day = day
+        self.slot = slot
+        self.subject = subject
+        self.day_slots = day_slots
+        self.revision = revision
+
+    def __len__(self):
+        return len(self.day)
+
+    @property
+    def num_days(self):
+        return len(self.day_slots)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ("day", "slot", "subject", "day_slots", "revision"))
+
+    def dates(self):
+        """
+        Calendar date of every slot as a datetime64[D] array
+        """
+        return np.datetime64(self.start_date, "D") + self.day.astype("timedelta64[D]")
+
+    def minutes_per_subject(self):
+        """
+        Days x subjects matrix of planned minutes
+        """
+        counts = np.zeros((self.num_days, len(self.subjects)), dtype=np.int64)
+        np.add.at(counts, (self.day, self.subject), 1)
+        return counts * self.slot_minutes
+
+    def to_dataframe(self):
+        """
+        Long-format DataFrame for display or export (one row per slot)
+        """
+        return pd.DataFrame({
+            "Date": self.dates(),
+            "Slot": self.slot,
+            "Subject": pd.Categorical.from_codes(self.subject, self.subjects),
+            "Minutes": np.full(len(self), self.slot_minutes, dtype=np.int16),
+            "Revision": self.revision[self.day],
+        })
+
+
+def review_days(num_days, intervals=REVIEW_INTERVALS):
+    """
+    Boolean mask of spaced-repetition revision days within the horizon
+    """
+    mask = np.zeros(num_days, dtype=bool)
+    days = np.cumsum(intervals)
+    mask[days[days < num_days]] = True
+    return mask
+
+
+def build_timetable(subjects, weights, daily_hours, exam_date, start_date=None,
+                    slot_minutes=POMODORO_MINUTES, review_intervals=REVIEW_INTERVALS,
+                    ramp_days=7, ramp_factor=1.5, max_daily_hours=16):
+    """
+    Expand a daily plan into a timetable covering every day until
+    ``exam_date``.
+
+    Regular days split ``daily_hours`` by ``weights``; revision days (spaced
+    by ``review_intervals``) give every subject an equal share. Over the last
+    ``ramp_days`` days the daily hours ramp up linearly to ``ramp_factor``
+    times the normal amount, capped at ``max_daily_hours``. Each day is
+    apportioned into whole ``slot_minutes`` slots, so the slots of a day
+    always add up to its budget.
+    """
+    start_date = date.today() if start_date is None else start_date
+    num_days = calculate_days_remaining(exam_date, today=start_date)
+    num_subjects = len(subjects)
+    if num_subjects == 0 or len(weights) != num_subjects:
+        raise ValueError("need one weight per subject")
+
+    revision = review_days(num_days, review_intervals)
+
+    # Daily hours with the pre-exam ramp-up
+    hours = np.full(num_days, float(daily_hours))
+    if ramp_days > 0:
+        days_left = num_days - np.arange(num_days)
+        ramp = np.clip((ramp_days - days_left + 1) / ramp_days, 0, 1)
+        hours = np.minimum(hours * (1 + (ramp_factor - 1) * ramp), max(max_daily_hours, daily_hours))
+    budgets = np.floor(hours * 60 / slot_minutes + 1e-9).astype(np.int64)
+
+    # One apportionment segment per day
+    day_weights = np.where(revision[:, None], 1.0, np.asarray(weights, dtype=np.float64)[None, :])
+    offsets = np.arange(0, num_days * num_subjects + 1, num_subjects)
+    counts = apportion(day_weights.ravel(), offsets, budgets)
+
+    day_slots = budgets.astype(np.int16)
+    subject_dtype = np.int8 if num_subjects <= np.iinfo(np.int8).max else np.int16
+    subject = np.repeat(np.tile(np.arange(num_subjects, dtype=subject_dtype), num_days), counts)
+    day = np.repeat(np.arange(num_days, dtype=np.int16), budgets)
+    day_start = np.concatenate(([0], np.cumsum(budgets)[:-1]))
+    slot = (np.arange(len(day)) - day_start[day]).astype(np.int16)
+
+    return Timetable(start_date, subjects, slot_minutes, day, slot, subject, day_slots, revision)
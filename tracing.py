@@ -0,0 +1,208 @@
+"""
+Lightweight timing spans for the request pipeline.
+
+Tracing is off unless ``STUDY_PLANNER_TRACE=1`` is set (or ``enable()`` is
+called); a disabled ``@traced`` function costs one global check per call.
+With ``STUDY_PLANNER_TRACE_MEMORY=1`` spans also record their tracemalloc
+high-water mark. Aggregates (p50/p95/p99 per stage) can be read with
+``summary()`` or exported in Prometheus text format to a file or a small
+local HTTP endpoint.
+"""
+import functools
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Samples kept per stage for percentiles
+WINDOW = 10000
+
+METRIC_PREFIX = "study_planner_stage"
+
+# Optional exports used by the app when tracing is on
+METRICS_FILE = os.environ.get("STUDY_PLANNER_METRICS_FILE")
+METRICS_PORT = int(os.environ.get("STUDY_PLANNER_METRICS_PORT", "0")) or None
+
+_enabled = os.environ.get("STUDY_PLANNER_TRACE", "") not in ("", "0")
+_trace_memory = os.environ.get("STUDY_PLANNER_TRACE_MEMORY", "") not in ("", "0")
+
+_lock = threading.Lock()
+_durations = defaultdict(lambda: deque(maxlen=WINDOW))
+_totals = defaultdict(lambda: [0, 0.0])  # stage -> [count, seconds] since start
+_peak_memory = defaultdict(int)
+_local = threading.local()
+
+def enable(memory=None):
+    global _enabled, _trace_memory
+    _enabled = True
+    if memory is not None:
+        _trace_memory = memory
+    if _trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _durations.clear()
+        _totals.clear()
+        _peak_memory.clear()
+
+def _memory_stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+@contextmanager
+def span(name):
+    """
+    Time the enclosed block as stage ``name``
+    """
+    if not _enabled:
+        yield
+        return
+
+    memory = _trace_memory and tracemalloc.is_tracing()
+    if memory:
+        # tracemalloc has a single peak counter, so nested spans hand their
+        # peak up to the parent before resetting it for themselves
+        stack = _memory_stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, 0]
+        stack.append(frame)
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        high_water = 0
+        if memory:
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+            stack.pop()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            high_water = peak - frame[0]
+        _record(name, elapsed, high_water)
+
+def _record(name, elapsed, high_water=0):
+    with _lock:
+        _durations[name].append(elapsed)
+        totals = _totals[name]
+        totals[0] += 1
+        totals[1] += elapsed
+        if high_water > _peak_memory[name]:
+            _peak_memory[name] = high_water
+
+def traced(name):
+    """
+    Decorator that records every call of the function as stage ``name``
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def summary():
+    """
+    Per-stage aggregates: count, total/mean seconds, p50/p95/p99 over the last
+    WINDOW calls and the peak traced memory in bytes
+    """
+    with _lock:
+        snapshot = {name: (np.fromiter(samples, dtype=np.float64), tuple(_totals[name]), _peak_memory[name])
+                    for name, samples in _durations.items()}
+    result = {}
+    for name, (samples, (count, total), peak) in sorted(snapshot.items()):
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        result[name] = {
+            "count": count,
+            "total": total,
+            "mean": total / count,
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "peak_memory": peak,
+        }
+    return result
+
+def to_prometheus():
+    """
+    Render summary() in the Prometheus text exposition format
+    """
+    stats = summary()
+    lines = [
+        f"# HELP {METRIC_PREFIX}_seconds Time spent per pipeline stage",
+        f"# TYPE {METRIC_PREFIX}_seconds summary",
+    ]
+    for name, s in stats.items():
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+            lines.append(f'{METRIC_PREFIX}_seconds{{stage="{label}",quantile="{quantile}"}} {s[key]:.9f}')
+        lines.append(f'{METRIC_PREFIX}_seconds_sum{{stage="{label}"}} {s["total"]:.9f}')
+        lines.append(f'{METRIC_PREFIX}_seconds_count{{stage="{label}"}} {s["count"]}')
+    lines += [
+        f"# HELP {METRIC_PREFIX}_peak_memory_bytes Highest tracemalloc high-water mark per stage",
+        f"# TYPE {METRIC_PREFIX}_peak_memory_bytes gauge",
+    ]
+    for name, s in stats.items():
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{METRIC_PREFIX}_peak_memory_bytes{{stage="{label}"}} {s["peak_memory"]}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path):
+    """
+    Atomically write the metrics to ``path`` (e.g. for node_exporter's
+    textfile collector)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(to_prometheus())
+    os.replace(tmp_path, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = to_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_prometheus(port, host="127.0.0.1"):
+    """
+    Serve /metrics on a daemon thread; returns the server (call shutdown())
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+if _enabled:
+    enable()
@@ -1,7 +1,18 @@
 from datetime import date
 
-def calculate_days_remaining(exam_date):
-    return max((exam_date - date.today()).days, 1)
+import numpy as np
+
+def calculate_days_remaining(exam_date, today=None):
+    today = date.today() if today is None else today
+    return max((exam_date - today).days, 1)
+
+def days_until(exam_dates, today=None):
+    """
+    calculate_days_remaining for many exam dates at once, as an int array
+    """
+    today = date.today() if today is None else today
+    days = np.asarray(exam_dates, dtype="datetime64[D]") - np.datetime64(today, "D")
+    return np.maximum(days.astype(np.int64), 1)
 
 def get_weakest_subject(subjects, weights):
     return subjects[weights.index(max(weights))]